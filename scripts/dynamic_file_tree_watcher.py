@@ -7,7 +7,8 @@ This script monitors a specified directory and updates a file with the directory
 It uses the `watchdog` library to watch for file system events and logs activities.
 
 Usage:
-    python dynamic_file_tree_watcher.py -d <directory> -o <output_file> -s -f -l <log_file> -u -i <update_interval> --cache-file <cache_file>
+    python dynamic_file_tree_watcher.py -d <directory> -o <output_file> -s -f -l <log_file> -u -i <update_interval>
+        --debounce <seconds> --cache-file <cache_file> --scan-workers <n>
 
 Arguments:
     -d, --directory       Specify directory to monitor (default is current directory).
@@ -16,19 +17,22 @@ Arguments:
     -f, --follow-symlinks Follow symbolic links.
     -l, --log-file        Log file to store logs.
     -u, --update          Enable dynamic updates using watchdog.
-    -i, --update-interval Minimum interval between updates in seconds (default is 5.0).
-    --cache-file          File to store the cache (default is .tree_cache.pkl).
+    -i, --update-interval Maximum delay before pending changes are written under continuous activity (default is 5.0).
+    --debounce            Quiet period per directory before changes are applied (default is 0.5).
+    --scan-workers        Threads used to scan directories (default is 4 per CPU, up to 32).
+    --cache-file          File to store the tree snapshot (default is .tree_snapshot.jsonl).
 """
 
 import os
 import argparse
 import logging
 import pathspec
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
-from collections import deque
-import pickle
+import json
 
 def setup_logging(log_file=None):
     """
@@ -56,12 +60,17 @@ def load_gitignore(directory):
     """
     gitignore_path = os.path.join(directory, '.gitignore')
     if os.path.exists(gitignore_path):
-        with open(gitignore_path, 'r') as f:
-            gitignore_content = f.read()
+        try:
+            with open(gitignore_path, 'r') as f:
+                gitignore_content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            logging.warning(f"Skipping unreadable {gitignore_path}: {e}")
+            return None
         return pathspec.PathSpec.from_lines('gitwildmatch', gitignore_content.splitlines())
     return None
 
-def print_directory_tree(directory, show_hidden=False, follow_symlinks=False, gitignore_spec=None):
+def print_directory_tree(directory, show_hidden=False, follow_symlinks=False, gitignore_spec=None,
+                         nested_gitignore=True):
     """
     Generate a directory tree structure.
 
@@ -70,196 +79,845 @@ def print_directory_tree(directory, show_hidden=False, follow_symlinks=False, gi
         show_hidden (bool, optional): Whether to include hidden files. Defaults to False.
         follow_symlinks (bool, optional): Whether to follow symbolic links. Defaults to False.
         gitignore_spec (pathspec.PathSpec, optional): PathSpec object for matching ignored paths.
+        nested_gitignore (bool, optional): Whether to honor .gitignore files found while scanning. Defaults to True.
 
     Returns:
         list: A list of strings representing the directory tree.
     """
-    tree = []
+    tree = DirectoryTree(directory, show_hidden, follow_symlinks, gitignore_spec, nested_gitignore=nested_gitignore)
+    try:
+        return tree.render()
+    finally:
+        tree.close()
+
+def save_tree_to_file(tree, output_file):
+    """
+    Save the directory tree to a file.
+
+    Args:
+        tree (list): The directory tree structure.
+        output_file (str): The file to save the tree to.
+    """
+    # Write to a temporary file and rename it into place so readers never see a partial tree
+    tmp_file = output_file + '.tmp'
+    try:
+        with open(tmp_file, 'w') as f:
+            for line in tree:
+                f.write(line + '\n')
+        os.replace(tmp_file, output_file)
+    except IOError as e:
+        logging.error(f"Error writing to file {output_file}: {e}")
+
+class TreeNode:
+    """
+    A file or directory in the in-memory tree.
 
-    def build_tree(current_path, current_indent):
+    The tree doubles as a trie keyed on path components: directories keep their visible entries in
+    ``children`` keyed by name (None for files and for symlinked directories that are not followed), and
+    each directory caches the rendered rows of its own entries in ``lines``. Rows carry no indent; it is
+    added while rendering, so the cache stays proportional to the number of entries rather than to
+    entries times depth, and a subtree stays valid when its siblings change.
+    """
+
+    __slots__ = ('name', 'is_dir', 'children', 'permission_denied', 'lines', 'mtime')
+
+    def __init__(self, name, is_dir=False):
+        self.name = name
+        self.is_dir = is_dir
+        self.children = None
+        self.permission_denied = False
+        self.lines = None
+        # Directory mtime (ns) observed when the entries were listed, used to validate snapshots
+        self.mtime = None
+
+    def sorted_children(self):
+        return [self.children[name] for name in sorted(self.children)]
+
+
+class DirectoryTree:
+    """
+    In-memory model of a directory tree that is patched from file system events instead of rescanned.
+
+    Cold scans list directories with ``os.scandir`` (using the d_type it returns instead of a stat per
+    entry), one tree level at a time, with the directories of each level listed in parallel on a thread
+    pool. Ignored directories are pruned before they are descended into. Output order does not depend on
+    scan order because children are sorted when rendering.
+
+    Args:
+        directory (str): The root directory.
+        show_hidden (bool): Whether to include hidden files.
+        follow_symlinks (bool): Whether to descend into symlinked directories.
+        gitignore_spec (pathspec.PathSpec, optional): Extra patterns, relative to the root, for ignored paths.
+        root_node (TreeNode, optional): Previously built tree to start from instead of scanning.
+        snapshot_records (dict, optional): Directory records loaded by ``TreeSnapshot`` to restore from; only
+            directories whose mtime changed since the snapshot are rescanned.
+        nested_gitignore (bool, optional): Whether to honor the .gitignore file of every directory, like git
+            does. Defaults to True.
+        max_workers (int, optional): Size of the scan thread pool.
+    """
+
+    def __init__(self, directory, show_hidden=False, follow_symlinks=False, gitignore_spec=None, root_node=None,
+                 nested_gitignore=True, max_workers=None, snapshot_records=None):
+        # Normalized once so a trailing slash never makes tree paths compare unequal to the root
+        self.directory = os.path.normpath(directory)
+        self.abs_directory = os.path.abspath(directory)
+        self._root_prefix = os.path.join(self.directory, '')
+        self.show_hidden = show_hidden
+        self.follow_symlinks = follow_symlinks
+        self.gitignore_spec = gitignore_spec
+        self.nested_gitignore = nested_gitignore
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) * 4)
+        self.executor = None
+        # Tree path of a directory -> tuple of (base directory, PathSpec) applying to its entries, outermost first
+        self.ignore_rules = {}
+        # Tree path of a directory -> mtime (ns) of its .gitignore
+        self.gitignore_mtimes = {}
+        # Directories whose listing changed since the last snapshot save
+        self.dirty_dirs = set()
+        if root_node is not None:
+            self.root_node = root_node
+        elif snapshot_records:
+            self.root_node = self.restore(snapshot_records)
+        else:
+            self.root_node = self.scan(self.directory, self.directory)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def parent_rules(self, path):
+        """Return the ignore rules inherited by directory ``path``, before its own .gitignore."""
+        # Never walk above the root: .gitignore files outside the watched tree do not apply to it
+        if path == self.directory or not path.startswith(self._root_prefix):
+            return ((self.directory, self.gitignore_spec),) if self.gitignore_spec else ()
+        return self.rules_for(os.path.dirname(path))
+
+    def rules_for(self, path):
+        """Return the ignore rules that apply to the entries of directory ``path``."""
+        rules = self.ignore_rules.get(path)
+        if rules is None:
+            rules = self.parent_rules(path)
+            if self.nested_gitignore:
+                spec = load_gitignore(path)
+                if spec:
+                    rules = rules + ((path, spec),)
+            self.ignore_rules[path] = rules
+        return rules
+
+    @staticmethod
+    def is_ignored(rules, path, is_dir):
+        # The innermost .gitignore with a matching pattern decides, so negations in subdirectories win
+        for base, spec in reversed(rules):
+            relative = os.path.relpath(path, base)
+            if is_dir:
+                relative += '/'
+            include = spec.check_file(relative).include
+            if include is not None:
+                return include
+        return False
+
+    def is_visible(self, parent_path, name, is_dir=False):
+        if not self.show_hidden and name.startswith('.'):
+            return False
+        rules = self.rules_for(parent_path)
+        return not (rules and self.is_ignored(rules, os.path.join(parent_path, name), is_dir))
+
+    def _list_directory(self, path, parent_rules):
+        """
+        List the visible entries of ``path``.
+
+        Returns:
+            tuple: A list of ``(name, is_dir, is_symlink)`` (None if permission was denied), the ignore
+            rules for the directory's entries, the directory mtime and the .gitignore mtime (or None).
+        """
+        rules = parent_rules
+        gitignore_mtime = None
         try:
-            entries = sorted(os.listdir(current_path))
+            # Stat before listing so a change racing with the scan invalidates the recorded mtime
+            mtime = os.stat(path).st_mtime_ns
+            with os.scandir(path) as it:
+                entries = list(it)
         except PermissionError:
-            tree.append(f"{current_indent}[Permission Denied: {current_path}]")
-            logging.error(f"Permission denied for directory: {current_path}")
+            return None, rules, None, None
+        except (FileNotFoundError, NotADirectoryError):
+            return [], rules, None, None
+        if self.nested_gitignore:
+            for entry in entries:
+                if entry.name == '.gitignore':
+                    try:
+                        gitignore_mtime = entry.stat().st_mtime_ns
+                    except OSError:
+                        # Deleted or unreadable since the listing; a later event reloads the rules
+                        break
+                    spec = load_gitignore(path)
+                    if spec:
+                        rules = rules + ((path, spec),)
+                    break
+
+        listed = []
+        for entry in entries:
+            if not self.show_hidden and entry.name.startswith('.'):
+                continue
+            try:
+                is_dir = entry.is_dir()
+                is_symlink = is_dir and entry.is_symlink()
+            except OSError:
+                is_dir = is_symlink = False
+            if rules and self.is_ignored(rules, entry.path, is_dir):
+                continue
+            listed.append((entry.name, is_dir, is_symlink))
+        return listed, rules, mtime, gitignore_mtime
+
+    def _record_listing(self, path, node, rules, mtime, gitignore_mtime):
+        self.ignore_rules[path] = rules
+        node.mtime = mtime
+        if gitignore_mtime is None:
+            self.gitignore_mtimes.pop(path, None)
+        else:
+            self.gitignore_mtimes[path] = gitignore_mtime
+        self.dirty_dirs.add(path)
+
+    def _scan_levels(self, frontier):
+        """Breadth-first scan of ``(node, path, parent_rules)`` directories, listing each level in parallel."""
+        while frontier:
+            if len(frontier) > 1 and self.max_workers > 1:
+                if self.executor is None:
+                    self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='tree-scan')
+                results = list(self.executor.map(lambda item: self._list_directory(item[1], item[2]), frontier))
+            else:
+                results = [self._list_directory(path, rules) for _, path, rules in frontier]
+
+            next_frontier = []
+            for (node, path, _), (listed, rules, mtime, gitignore_mtime) in zip(frontier, results):
+                self._record_listing(path, node, rules, mtime, gitignore_mtime)
+                if listed is None:
+                    node.permission_denied = True
+                    logging.error(f"Permission denied for directory: {path}")
+                    continue
+                for name, is_dir, is_symlink in listed:
+                    child = TreeNode(name, is_dir)
+                    node.children[name] = child
+                    if is_dir and (self.follow_symlinks or not is_symlink):
+                        child.children = {}
+                        next_frontier.append((child, os.path.join(path, name), rules))
+            frontier = next_frontier
+
+    def scan(self, path, name):
+        """
+        Build the subtree rooted at ``path`` from the file system.
+
+        Returns:
+            TreeNode: The scanned node.
+        """
+        if not os.path.isdir(path):
+            return TreeNode(name)
+        node = TreeNode(name, is_dir=True)
+        if not self.follow_symlinks and os.path.islink(path) and path != self.directory:
+            return node
+        node.children = {}
+        self._scan_levels([(node, path, self.parent_rules(path))])
+        return node
+
+    def to_tree_path(self, path):
+        """Return ``path`` expressed relative to the tree root, using the root's spelling, or None if outside."""
+        relative = os.path.relpath(os.path.abspath(path), self.abs_directory)
+        if relative == os.curdir:
+            return self.directory
+        if relative.split(os.sep)[0] == os.pardir:
+            return None
+        return os.path.join(self.directory, relative)
+
+    def find(self, path):
+        """Look up the node for ``path`` by walking its components from the root."""
+        relative = os.path.relpath(os.path.abspath(path), self.abs_directory)
+        node = self.root_node
+        if relative == os.curdir:
+            return node
+        for part in relative.split(os.sep):
+            if part == os.pardir or node.children is None:
+                return None
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def add_path(self, path):
+        """
+        Insert (or rescan) ``path`` into its parent directory, or remove it if it no longer exists.
+
+        Returns:
+            str: The tree path of the directory whose entries changed, or None if nothing changed.
+        """
+        path = self.to_tree_path(path)
+        if path is None or path == self.directory:
+            return None
+        return self._sync_path(path)
+
+    def remove_path(self, path):
+        """
+        Remove ``path`` from its parent directory, unless it exists again on disk.
+
+        Events are grouped and flushed per directory, so a deletion can be applied after a later event that
+        recreated the path; checking the file system keeps the tree correct whatever the order.
+
+        Returns:
+            str: The tree path of the directory whose entries changed, or None if nothing changed.
+        """
+        path = self.to_tree_path(path)
+        if path is None or path == self.directory:
+            return None
+        return self._sync_path(path)
+
+    def _sync_path(self, path):
+        """Make the tree entry for tree path ``path`` match the file system."""
+        parent_path, name = os.path.split(path)
+        parent = self.find(parent_path)
+        if parent is None or parent.children is None:
+            return None
+        if not os.path.lexists(path) or not self.is_visible(parent_path, name, os.path.isdir(path)):
+            if parent.children.pop(name, None) is None:
+                return None
+        else:
+            parent.children[name] = self.scan(path, name)
+        self._touch(parent_path, parent)
+        return parent_path
+
+    def _touch(self, path, node):
+        """Record that the listing of directory ``path`` was patched."""
+        try:
+            node.mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            node.mtime = None
+        self.dirty_dirs.add(path)
+
+    def refresh_directory(self, path):
+        """
+        Reconcile the direct entries of ``path`` with the file system without rescanning unchanged children.
+
+        Returns:
+            str: The tree path of the directory if its entries changed, or None.
+        """
+        path = self.to_tree_path(path)
+        node = self.find(path) if path is not None else None
+        if node is None or node.children is None:
+            return None
+        listed, rules, mtime, gitignore_mtime = self._list_directory(path, self.parent_rules(path))
+        self._record_listing(path, node, rules, mtime, gitignore_mtime)
+        if listed is None:
+            node.permission_denied = True
+            return path
+        node.permission_denied = False
+        entries = {name: is_dir for name, is_dir, _ in listed}
+        changed = False
+        for name in set(node.children) - set(entries):
+            del node.children[name]
+            changed = True
+        for name, is_dir in entries.items():
+            child = node.children.get(name)
+            if child is None or child.is_dir != is_dir:
+                node.children[name] = self.scan(os.path.join(path, name), name)
+                changed = True
+        return path if changed else None
+
+    def reload_gitignore(self, path):
+        """
+        Re-read the ignore rules of directory ``path`` after its .gitignore changed and rescan its subtree.
+
+        Returns:
+            str: The tree path of the directory, or None if it is not in the tree.
+        """
+        path = self.to_tree_path(path)
+        node = self.find(path) if path is not None else None
+        if node is None or node.children is None:
+            return None
+        prefix = path + os.sep
+        for cached_path in [p for p in self.ignore_rules if p == path or p.startswith(prefix)]:
+            del self.ignore_rules[cached_path]
+        rescanned = self.scan(path, node.name)
+        node.children = rescanned.children
+        node.permission_denied = rescanned.permission_denied
+        node.mtime = rescanned.mtime
+        return path
+
+    def apply_event(self, event):
+        """
+        Patch the tree for a watchdog event.
+
+        Returns:
+            set: Tree paths of the directories whose entries changed.
+        """
+        changed = set()
+        gitignore_paths = [p for p in (event.src_path, getattr(event, 'dest_path', None) or '')
+                           if os.path.basename(p) == '.gitignore']
+        if self.nested_gitignore:
+            for gitignore_path in gitignore_paths:
+                changed.add(self.reload_gitignore(os.path.dirname(gitignore_path)))
+        if event.event_type == 'created':
+            changed.add(self.add_path(event.src_path))
+        elif event.event_type == 'deleted':
+            changed.add(self.remove_path(event.src_path))
+        elif event.event_type == 'moved':
+            changed.add(self.remove_path(event.src_path))
+            changed.add(self.add_path(event.dest_path))
+        elif event.event_type == 'modified' and event.is_directory:
+            changed.add(self.refresh_directory(event.src_path))
+        changed.discard(None)
+        return changed
+
+    def directory_records(self, paths=None):
+        """
+        Yield snapshot records for the given tree paths (default: every directory in the tree).
+
+        A record holds the directory's mtime and its entries as ``[name, kind]`` pairs, where kind is
+        ``d`` for a scanned directory, ``l`` for an unfollowed symlinked directory and ``f`` for a file.
+        """
+        if paths is None:
+            stack = [(self.directory, self.root_node)]
+            items = []
+            while stack:
+                path, node = stack.pop()
+                items.append((path, node))
+                stack.extend((os.path.join(path, child.name), child) for child in node.children.values()
+                             if child.children is not None)
+        else:
+            items = [(path, self.find(path)) for path in paths]
+        for path, node in items:
+            if node is None or node.children is None:
+                continue
+            record = {
+                "path": os.path.relpath(path, self.directory),
+                "mtime": node.mtime,
+                "entries": [[child.name, 'f' if not child.is_dir else 'd' if child.children is not None else 'l']
+                            for child in node.children.values()]
+            }
+            if node.permission_denied:
+                record["denied"] = True
+            if path in self.gitignore_mtimes:
+                record["gitignore_mtime"] = self.gitignore_mtimes[path]
+            yield record
+
+    def restore(self, records):
+        """
+        Rebuild the tree from snapshot records, then rescan only what changed on disk.
+
+        Each restored directory is validated with a single stat: if its mtime differs from the snapshot its
+        entries are reconciled, and if its .gitignore changed its subtree is rescanned.
+
+        Returns:
+            TreeNode: The root node.
+        """
+        self.root_node = TreeNode(self.directory, is_dir=True)
+        self.root_node.children = {}
+        restored = []
+        stack = [(self.directory, os.curdir, self.root_node)]
+        while stack:
+            path, relative, node = stack.pop()
+            record = records.get(relative)
+            if record is None:
+                node.children = self.scan(path, node.name).children
+                continue
+            node.mtime = record.get("mtime")
+            node.permission_denied = record.get("denied", False)
+            if "gitignore_mtime" in record:
+                self.gitignore_mtimes[path] = record["gitignore_mtime"]
+            restored.append((path, node))
+            for name, kind in record["entries"]:
+                child = TreeNode(name, is_dir=kind != 'f')
+                node.children[name] = child
+                if kind == 'd':
+                    child.children = {}
+                    stack.append((os.path.join(path, name), os.path.normpath(os.path.join(relative, name)), child))
+
+        def current_mtimes(path):
+            try:
+                directory_mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                return None, None
+            try:
+                gitignore_mtime = os.stat(os.path.join(path, '.gitignore')).st_mtime_ns
+            except OSError:
+                gitignore_mtime = None
+            return directory_mtime, gitignore_mtime
+
+        if len(restored) > 1 and self.max_workers > 1:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='tree-scan')
+            mtimes = list(self.executor.map(lambda item: current_mtimes(item[0]), restored))
+        else:
+            mtimes = [current_mtimes(path) for path, _ in restored]
+
+        stale = 0
+        # Parents first, so directories that disappeared are dropped before their descendants are visited
+        for (path, node), (directory_mtime, gitignore_mtime) in sorted(
+                zip(restored, mtimes), key=lambda item: item[0][0].count(os.sep)):
+            if self.nested_gitignore and gitignore_mtime != self.gitignore_mtimes.get(path):
+                stale += self.reload_gitignore(path) is not None
+            elif directory_mtime != node.mtime:
+                self.refresh_directory(path)
+                stale += 1
+        logging.info(f"Restored {len(restored)} directories from snapshot, {stale} rescanned")
+        return self.root_node
+
+    def invalidate(self, path):
+        """
+        Drop the cached rows of ``path`` and its ancestors.
+
+        Only the nodes on the path from the root are touched; descendants and siblings keep their cached
+        rows because they do not depend on where the subtree is drawn.
+        """
+        relative = os.path.relpath(os.path.abspath(path), self.abs_directory)
+        node = self.root_node
+        node.lines = None
+        if relative == os.curdir:
             return
-        
-        entries = [e for e in entries if show_hidden or not e.startswith('.')]
-        if gitignore_spec:
-            entries = [e for e in entries if not gitignore_spec.match_file(os.path.join(current_path, e))]
-        
-        for count, entry in enumerate(entries):
-            entry_path = os.path.join(current_path, entry)
-            if count == len(entries) - 1:
+        for part in relative.split(os.sep):
+            if part == os.pardir or node.children is None:
+                return
+            node = node.children.get(part)
+            if node is None:
+                return
+            node.lines = None
+
+    def render(self):
+        """
+        Render the tree, reusing cached rows for unchanged directories.
+
+        Returns:
+            list: A list of strings representing the directory tree.
+        """
+        lines = [self.directory]
+        self._render_lines(self.root_node, self.directory, '', lines)
+        return lines
+
+    def _rows(self, node, current_path):
+        """Return the cached ``(row, child to descend into or None, indent for that child)`` entries of ``node``."""
+        if node.lines is not None:
+            return node.lines
+        if node.permission_denied:
+            node.lines = [(f"[Permission Denied: {current_path}]", None, None)]
+            return node.lines
+
+        rows = []
+        children = node.sorted_children()
+        for count, child in enumerate(children):
+            if count == len(children) - 1:
                 connector = "└──"
-                new_indent = current_indent + "    "
+                child_indent = "    "
             else:
                 connector = "├──"
-                new_indent = current_indent + "│   "
+                child_indent = "│   "
 
-            if os.path.isdir(entry_path):
-                tree.append(f"{current_indent}{connector} {entry}/")
-                if follow_symlinks or not os.path.islink(entry_path):
-                    build_tree(entry_path, new_indent)
+            if child.is_dir:
+                rows.append((f"{connector} {child.name}/", child if child.children is not None else None,
+                             child_indent))
             else:
-                tree.append(f"{current_indent}{connector} {entry}")
+                rows.append((f"{connector} {child.name}", None, None))
+        node.lines = rows
+        return rows
 
-    tree.append(directory)
-    build_tree(directory, "")
-    return tree
+    def _render_lines(self, node, current_path, prefix, lines):
+        for row, child, child_indent in self._rows(node, current_path):
+            lines.append(prefix + row)
+            if child is not None:
+                self._render_lines(child, os.path.join(current_path, child.name), prefix + child_indent, lines)
 
-def save_tree_to_file(tree, output_file):
+
+class TreeSnapshot:
     """
-    Save the directory tree to a file.
+    Compact, versioned on-disk snapshot of a DirectoryTree.
+
+    The file is JSON lines: a header with the format version, root and scan options (including any extra
+    ignore patterns), followed by one record per directory (see ``DirectoryTree.directory_records``).
+    Saves append records only for directories that changed. On load, a later record for a path replaces
+    the earlier one. Once the file holds more than ``compact_ratio`` times as many records as there are
+    directories, it is rewritten from scratch. Records of directories no longer reachable from the root
+    are ignored on load.
 
     Args:
-        tree (list): The directory tree structure.
-        output_file (str): The file to save the tree to.
+        path (str): The snapshot file.
+        compact_ratio (float, optional): Rewrite threshold for appended records. Defaults to 2.0.
     """
-    try:
-        with open(output_file, 'w') as f:
-            for line in tree:
-                f.write(line + '\n')
-    except IOError as e:
-        logging.error(f"Error writing to file {output_file}: {e}")
+
+    FORMAT = 'dynamic-file-tree-snapshot'
+    VERSION = 1
+
+    def __init__(self, path, compact_ratio=2.0):
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.record_count = 0
+        self.live_count = 0
+
+    @classmethod
+    def header(cls, directory, show_hidden, follow_symlinks, nested_gitignore, gitignore_spec=None):
+        return {
+            "format": cls.FORMAT,
+            "version": cls.VERSION,
+            "root": os.path.abspath(directory),
+            "options": {
+                "show_hidden": show_hidden,
+                "follow_symlinks": follow_symlinks,
+                "nested_gitignore": nested_gitignore,
+                # The extra patterns decide which entries were recorded, so a different set invalidates the snapshot
+                "gitignore_patterns": ([pattern.pattern for pattern in gitignore_spec.patterns]
+                                       if gitignore_spec else None)
+            }
+        }
+
+    @staticmethod
+    def _dump(entry):
+        return json.dumps(entry, separators=(',', ':')) + '\n'
+
+    def load(self, tree_header):
+        """
+        Read the snapshot if it matches ``tree_header``.
+
+        Returns:
+            dict: Directory records keyed by path relative to the root, or None if there is no usable snapshot.
+        """
+        if not os.path.exists(self.path):
+            return None
+        records = {}
+        try:
+            with open(self.path, 'r') as f:
+                header = json.loads(f.readline())
+                if header != tree_header:
+                    logging.warning("Snapshot was written by another version or with other options. Rescanning.")
+                    return None
+                for count, line in enumerate(f, 1):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A save interrupted mid-append leaves a partial last line; earlier records are intact
+                        logging.warning(f"Ignoring truncated snapshot record at line {count + 1}")
+                        break
+                    records[record["path"]] = record
+                    self.record_count = count
+        except (OSError, ValueError, UnicodeDecodeError):
+            logging.warning("Failed to load snapshot. Rescanning the directory.")
+            return None
+        self.live_count = len(records)
+        return records
+
+    def save(self, tree):
+        """Persist the directories changed since the last save, compacting the file when it grows too large."""
+        dirty = tree.dirty_dirs
+        tree.dirty_dirs = set()
+        too_large = self.record_count + len(dirty) > self.compact_ratio * max(self.live_count, 1)
+        if not os.path.exists(self.path) or too_large:
+            self.write_full(tree)
+        elif dirty:
+            with open(self.path, 'a') as f:
+                for record in tree.directory_records(sorted(dirty)):
+                    f.write(self._dump(record))
+                    self.record_count += 1
+
+    def write_full(self, tree):
+        tmp_file = self.path + '.tmp'
+        count = 0
+        with open(tmp_file, 'w') as f:
+            f.write(self._dump(self.header(tree.directory, tree.show_hidden, tree.follow_symlinks,
+                                           tree.nested_gitignore, tree.gitignore_spec)))
+            for record in tree.directory_records():
+                f.write(self._dump(record))
+                count += 1
+        os.replace(tmp_file, self.path)
+        self.record_count = self.live_count = count
+
 
 class FileTreeHandler(FileSystemEventHandler):
-    def __init__(self, directory, output_file, show_hidden, follow_symlinks, gitignore_spec, update_interval, cache_file):
+    """
+    Keeps the output file in sync with the watched directory.
+
+    The observer thread only filters and enqueues events. A background worker groups them by directory,
+    waits until a directory has been quiet for ``debounce`` seconds (or has been pending for
+    ``update_interval`` seconds under continuous activity), then patches the tree, renders it and writes
+    the output atomically. Pending events are always flushed eventually, including on ``stop``.
+    """
+
+    IGNORED_EVENT_TYPES = ('opened', 'closed', 'closed_no_write')
+
+    def __init__(self, directory, output_file, show_hidden, follow_symlinks, gitignore_spec, update_interval,
+                 cache_file, debounce=0.5, scan_workers=None, nested_gitignore=True):
         self.directory = directory
         self.output_file = output_file
         self.show_hidden = show_hidden
         self.follow_symlinks = follow_symlinks
         self.gitignore_spec = gitignore_spec
+        self.nested_gitignore = nested_gitignore
         self.update_interval = update_interval
-        self.last_update = 0
-        self.event_queue = deque()
+        self.debounce = debounce
         self.cache_file = cache_file
-        self.tree_cache = self.load_cache()
-        self.update_tree(force=True)
+        # Our own writes (including the temp files used for atomic renames) must not trigger updates
+        self.ignored_paths = {os.path.abspath(p) for p in (output_file, output_file + '.tmp',
+                                                           cache_file, cache_file + '.tmp')}
+        # Pending events per directory: [first event time, last event time, events]
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.stopping = False
+        self.worker = None
+        self.snapshot = TreeSnapshot(cache_file)
+        self.tree = DirectoryTree(directory, show_hidden, follow_symlinks, gitignore_spec,
+                                  nested_gitignore=nested_gitignore, max_workers=scan_workers,
+                                  snapshot_records=self.load_cache())
+        self.update_tree()
 
     def load_cache(self):
-        if os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, 'rb') as f:
-                    return pickle.load(f)
-            except (pickle.UnpicklingError, EOFError):
-                logging.warning("Failed to load cache. Starting with an empty cache.")
-        return {}
+        return self.snapshot.load(TreeSnapshot.header(self.directory, self.show_hidden, self.follow_symlinks,
+                                                      self.nested_gitignore, self.gitignore_spec))
 
     def save_cache(self):
-        with open(self.cache_file, 'wb') as f:
-            pickle.dump(self.tree_cache, f)
-
-    def update_tree(self, force=False):
-        current_time = time.time()
-        if force or current_time - self.last_update >= self.update_interval:
-            directory_tree = self.generate_tree_with_cache(self.directory)
-            save_tree_to_file(directory_tree, self.output_file)
-            logging.info(f"File tree updated and saved to {self.output_file}")
-            self.last_update = current_time
-            self.event_queue.clear()
-            self.save_cache()
+        try:
+            self.snapshot.save(self.tree)
+        except OSError as e:
+            logging.error(f"Error writing snapshot {self.cache_file}: {e}")
+
+    def update_tree(self):
+        directory_tree = self.generate_tree_with_cache(self.directory)
+        save_tree_to_file(directory_tree, self.output_file)
+        logging.info(f"File tree updated and saved to {self.output_file}")
+        self.save_cache()
 
     def generate_tree_with_cache(self, directory):
-        tree = [directory]
-        self._build_tree_with_cache(directory, "", tree)
-        return tree
+        return self.tree.render()
+
+    def is_noise(self, event):
+        if event.event_type in self.IGNORED_EVENT_TYPES:
+            return True
+        # File content changes never alter the tree, except for ignore rules; directory mtime changes are reconciled
+        if event.event_type == 'modified' and not event.is_directory \
+                and os.path.basename(event.src_path) != '.gitignore':
+            return True
+        paths = [event.src_path] + ([event.dest_path] if event.event_type == 'moved' else [])
+        return all(os.path.abspath(path) in self.ignored_paths for path in paths)
 
-    def _build_tree_with_cache(self, current_path, current_indent, tree):
-        try:
-            entries = sorted(os.listdir(current_path))
-        except PermissionError:
-            tree.append(f"{current_indent}[Permission Denied: {current_path}]")
-            logging.error(f"Permission denied for directory: {current_path}")
+    def on_any_event(self, event):
+        if self.is_noise(event):
             return
-        
-        entries = [e for e in entries if self.show_hidden or not e.startswith('.')]
-        if self.gitignore_spec:
-            entries = [e for e in entries if not self.gitignore_spec.match_file(os.path.join(current_path, e))]
-        
-        for count, entry in enumerate(entries):
-            entry_path = os.path.join(current_path, entry)
-            if count == len(entries) - 1:
-                connector = "└──"
-                new_indent = current_indent + "    "
+        key = os.path.dirname(event.src_path)
+        now = time.monotonic()
+        with self.condition:
+            entry = self.pending.get(key)
+            if entry is None:
+                self.pending[key] = [now, now, [event]]
             else:
-                connector = "├──"
-                new_indent = current_indent + "│   "
-
-            if os.path.isdir(entry_path):
-                tree.append(f"{current_indent}{connector} {entry}/")
-                if self.follow_symlinks or not os.path.islink(entry_path):
-                    if entry_path in self.tree_cache:
-                        tree.extend(self.tree_cache[entry_path])
-                    else:
-                        subtree = []
-                        self._build_tree_with_cache(entry_path, new_indent, subtree)
-                        self.tree_cache[entry_path] = subtree
-                        tree.extend(subtree)
-            else:
-                tree.append(f"{current_indent}{connector} {entry}")
+                entry[1] = now
+                entry[2].append(event)
+            self.condition.notify()
+
+    def start(self):
+        """Start the background worker that applies pending events."""
+        self.stopping = False
+        self.worker = threading.Thread(target=self._run, name='file-tree-worker', daemon=True)
+        self.worker.start()
+
+    def stop(self):
+        """Stop the worker after flushing everything still pending."""
+        with self.condition:
+            self.stopping = True
+            self.condition.notify()
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+        self.flush()
+        self.tree.close()
+
+    def _due_directories(self, now):
+        """Return directories ready to flush and the delay until the next one becomes ready."""
+        due = []
+        next_due = None
+        for key, (first_seen, last_seen, _) in self.pending.items():
+            ready_at = min(last_seen + self.debounce, first_seen + self.update_interval)
+            if ready_at <= now:
+                due.append(key)
+            elif next_due is None or ready_at - now < next_due:
+                next_due = ready_at - now
+        return due, next_due
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if self.stopping:
+                    return
+                due, next_due = self._due_directories(time.monotonic())
+                if not due:
+                    self.condition.wait(timeout=next_due)
+                    continue
+                events = [event for key in due for event in self.pending.pop(key)[2]]
+            try:
+                self.process_events(events)
+            except Exception as e:
+                logging.error(f"Error updating file tree: {e}")
 
-    def on_any_event(self, event):
-        self.event_queue.append(event)
-        self.process_event_queue()
+    def flush(self):
+        """Apply every pending event immediately, regardless of debounce timers."""
+        with self.condition:
+            events = [event for entry in self.pending.values() for event in entry[2]]
+            self.pending.clear()
+        self.process_events(events)
 
-    def process_event_queue(self):
-        current_time = time.time()
-        if current_time - self.last_update >= self.update_interval and self.event_queue:
-            affected_paths = set()
-            while self.event_queue:
-                event = self.event_queue.popleft()
-                affected_paths.add(os.path.dirname(event.src_path))
-                if hasattr(event, 'dest_path'):
-                    affected_paths.add(os.path.dirname(event.dest_path))
+    def process_events(self, events):
+        changed_paths = set()
+        for event in events:
+            changed_paths |= self.tree.apply_event(event)
 
-            for path in affected_paths:
-                self.invalidate_cache(path)
+        for path in changed_paths:
+            self.invalidate_cache(path)
 
-            self.update_tree(force=True)
+        if changed_paths:
+            self.update_tree()
 
     def invalidate_cache(self, path):
-        for cached_path in list(self.tree_cache.keys()):
-            if cached_path.startswith(path):
-                del self.tree_cache[cached_path]
+        self.tree.invalidate(path)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Print directory tree to a file.')
-    parser.add_argument('-d', '--directory', type=str, default='.', help='Specify directory to monitor (default is current directory).')
-    parser.add_argument('-o', '--output', type=str, default='repo_file_tree.txt', help='Output file (default is repo_file_tree.txt).')
+    parser.add_argument('-d', '--directory', type=str, default='.',
+                        help='Specify directory to monitor (default is current directory).')
+    parser.add_argument('-o', '--output', type=str, default='repo_file_tree.txt',
+                        help='Output file (default is repo_file_tree.txt).')
     parser.add_argument('-s', '--show-hidden', action='store_true', help='Show hidden files.')
     parser.add_argument('-f', '--follow-symlinks', action='store_true', help='Follow symbolic links.')
     parser.add_argument('-l', '--log-file', type=str, help='Log file to store logs.')
     parser.add_argument('-u', '--update', action='store_true', help='Enable dynamic updates using watchdog.')
-    parser.add_argument('-i', '--update-interval', type=float, default=5.0, help='Minimum interval between updates in seconds (default is 5.0).')
-    parser.add_argument('--cache-file', type=str, default='.tree_cache.pkl', help='File to store the cache (default is .tree_cache.pkl).')
+    parser.add_argument('-i', '--update-interval', type=float, default=5.0,
+                        help='Maximum delay before pending changes are written under continuous activity, '
+                             'in seconds (default is 5.0).')
+    parser.add_argument('--debounce', type=float, default=0.5,
+                        help='Quiet period per directory before changes are applied, in seconds (default is 0.5).')
+    parser.add_argument('--cache-file', type=str, default='.tree_snapshot.jsonl',
+                        help='File to store the tree snapshot (default is .tree_snapshot.jsonl).')
+    parser.add_argument('--scan-workers', type=int, default=None,
+                        help='Threads used to scan directories (default is 4 per CPU, up to 32).')
 
     args = parser.parse_args()
     
     setup_logging(args.log_file)
 
-    gitignore_spec = load_gitignore(args.directory)
+    # .gitignore files, including the root one, are loaded per directory while scanning
+    gitignore_spec = None
 
     if args.update:
         event_handler = FileTreeHandler(args.directory, args.output, args.show_hidden,
                                         args.follow_symlinks, gitignore_spec, args.update_interval,
-                                        args.cache_file)
+                                        args.cache_file, args.debounce, args.scan_workers)
         observer = Observer()
         observer.schedule(event_handler, path=args.directory, recursive=True)
         
         try:
             logging.info(f"Starting directory watcher for {args.directory}")
+            event_handler.start()
             observer.start()
             while True:
                 time.sleep(1)
         except KeyboardInterrupt:
             observer.stop()
         observer.join()
+        event_handler.stop()
     else:
+        # Building the handler scans the tree and writes the output and cache once
         handler = FileTreeHandler(args.directory, args.output, args.show_hidden,
                                   args.follow_symlinks, gitignore_spec, args.update_interval,
-                                  args.cache_file)
-        directory_tree = handler.generate_tree_with_cache(args.directory)
-        save_tree_to_file(directory_tree, args.output)
-        handler.save_cache()
+                                  args.cache_file, scan_workers=args.scan_workers)
+        handler.tree.close()
         logging.info(f"File tree saved to {args.output}")
@@ -6,6 +6,7 @@ setup(
     packages=find_packages(),
     install_requires=[
         "networkx",
+        "numpy",
         # Add other dependencies here
     ],
     entry_points={
@@ -1,10 +1,9 @@
 import logging
 from taskmaster.cli.cli import main
-from taskmaster.logging_config import logging
 
-logging.debug("Starting __main__.py")
+logger = logging.getLogger(__name__)
 
 if __name__ == "__main__":
+    logger.debug("Starting __main__.py")
     main()
-
-logging.debug("Finished running main in __main__.py")
+    logger.debug("Finished running main in __main__.py")
@@ -0,0 +1,252 @@
+# taskmaster/agents/code_analysis.py
+
+import ast
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+_DIVISIONS = (ast.Div, ast.FloorDiv, ast.Mod)
+_MUTABLE_CALLS = {"list", "dict", "set", "defaultdict", "OrderedDict"}
+
+
+def content_hash(code: str) -> str:
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+class ParseCache:
+    """LRU cache of parsed ASTs keyed by the SHA-256 of the source.
+
+    Review and bug identification on the same code, or the same file submitted by
+    several workflows, parse it once.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._trees: "OrderedDict[str, ast.Module]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, code: str) -> Tuple[str, ast.Module]:
+        """Return the content hash and tree for code; raises SyntaxError like ``ast.parse``."""
+        digest = content_hash(code)
+        with self._lock:
+            tree = self._trees.get(digest)
+            if tree is not None:
+                self._trees.move_to_end(digest)
+                self.hits += 1
+                return digest, tree
+            self.misses += 1
+        tree = ast.parse(code)
+        with self._lock:
+            self._trees[digest] = tree
+            if len(self._trees) > self.max_entries:
+                self._trees.popitem(last=False)
+        return digest, tree
+
+
+parse_cache = ParseCache()
+
+
+def _is_zero(node: ast.AST) -> bool:
+    return isinstance(node, ast.Constant) and isinstance(node.value, (int, float, complex)) \
+        and not isinstance(node.value, bool) and node.value == 0
+
+
+def _is_mutable(node: ast.AST) -> bool:
+    return isinstance(node, (ast.List, ast.Dict, ast.Set)) or (
+        isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _MUTABLE_CALLS)
+
+
+class _Scope:
+    __slots__ = ('parent', 'is_function', 'assigned', 'constants', 'declared', 'checked', 'loaded', 'guarded',
+                 'divisions')
+
+    def __init__(self, parent: Optional['_Scope'], is_function: bool):
+        self.parent = parent
+        self.is_function = is_function
+        self.assigned: Dict[str, int] = {}
+        self.constants: Set[str] = set()
+        self.declared: Set[str] = set()
+        self.checked: Set[str] = set()
+        self.loaded: Set[str] = set()
+        self.guarded = False
+        self.divisions: List[Tuple[int, ast.AST]] = []
+
+
+class _Analyzer:
+    """Single pass over a module that tracks function and class scopes.
+
+    Every check is fed from the same traversal, so analysis costs about as much as walking
+    the tree once rather than once per check. The walk uses an explicit stack: long but valid
+    expressions such as ``1 + 1 + ... + 1`` nest deeper than Python's recursion limit.
+    """
+
+    def __init__(self):
+        self.comments: List[Dict[str, Any]] = []
+        self.bugs: List[Dict[str, Any]] = []
+
+    def run(self, tree: ast.Module) -> Dict[str, List[Dict[str, Any]]]:
+        scope = _Scope(None, False)
+        # Work items are (node, scope, in_test); a None node finishes its scope once everything in it is visited.
+        # Visit order is otherwise irrelevant: every check only accumulates into its scope.
+        stack = [(None, scope, False)]
+        self._push_children(stack, tree, scope, False)
+        pop = stack.pop
+        while stack:
+            node, scope, in_test = pop()
+            if node is None:
+                self._finish(scope)
+            else:
+                self._visit(stack, node, scope, in_test)
+        self.comments.sort(key=lambda finding: finding["line"])
+        self.bugs.sort(key=lambda finding: finding["line"])
+        return {"review_comments": self.comments, "bugs": self.bugs}
+
+    @staticmethod
+    def _push_children(stack: list, node: ast.AST, scope: _Scope, in_test: bool):
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, list):
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        stack.append((item, scope, in_test))
+            elif isinstance(value, ast.AST):
+                stack.append((value, scope, in_test))
+
+    def _load(self, name: str, scope: _Scope, in_test: bool):
+        if in_test:
+            scope.checked.add(name)
+        # Loads count for every enclosing scope, so closures reading a variable keep it alive
+        while scope is not None:
+            scope.loaded.add(name)
+            scope = scope.parent
+
+    def _visit(self, stack: list, node: ast.AST, scope: _Scope, in_test: bool):
+        """Apply the checks for one node and push its children onto stack."""
+        if isinstance(node, ast.Name):
+            if not isinstance(node.ctx, ast.Store):
+                self._load(node.id, scope, in_test)
+            return
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            self._definition(stack, node, scope)
+            return
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name):
+                    # Nodes are not visited in source order, so keep the earliest assignment explicitly
+                    if target.lineno < scope.assigned.get(target.id, target.lineno + 1):
+                        scope.assigned[target.id] = target.lineno
+                    if isinstance(node.value, ast.Constant) and not _is_zero(node.value):
+                        scope.constants.add(target.id)
+        elif isinstance(node, ast.AugAssign):
+            if isinstance(node.target, ast.Name):
+                self._load(node.target.id, scope, in_test)
+            if isinstance(node.op, _DIVISIONS):
+                scope.divisions.append((node.lineno, node.value))
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, _DIVISIONS):
+            scope.divisions.append((node.lineno, node.right))
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            scope.declared.update(node.names)
+        elif isinstance(node, ast.ExceptHandler):
+            self._except_handler(node, scope)
+        elif isinstance(node, ast.Lambda):
+            self._mutable_defaults(node.args)
+        elif isinstance(node, (ast.If, ast.While, ast.IfExp, ast.Assert)):
+            stack.append((node.test, scope, True))
+            for field in node._fields:
+                if field != 'test':
+                    value = getattr(node, field)
+                    for item in value if isinstance(value, list) else [value]:
+                        if isinstance(item, ast.AST):
+                            stack.append((item, scope, in_test))
+            return
+        elif isinstance(node, (ast.Compare, ast.BoolOp)):
+            in_test = True
+        elif isinstance(node, ast.comprehension):
+            stack.append((node.target, scope, in_test))
+            stack.append((node.iter, scope, in_test))
+            stack.extend((condition, scope, True) for condition in node.ifs)
+            return
+        self._push_children(stack, node, scope, in_test)
+
+    def _definition(self, stack: list, node: ast.AST, scope: _Scope):
+        if not node.name.startswith('_') and ast.get_docstring(node, clean=False) is None:
+            kind = "class" if isinstance(node, ast.ClassDef) else "function"
+            self.comments.append({"line": node.lineno, "check": "missing-docstring",
+                                  "comment": f"Add a docstring to {kind} '{node.name}' explaining its purpose."})
+        # Decorators, defaults and base classes are evaluated in the enclosing scope
+        stack.extend((decorator, scope, False) for decorator in node.decorator_list)
+        if isinstance(node, ast.ClassDef):
+            stack.extend((base, scope, False) for base in node.bases + [keyword.value for keyword in node.keywords])
+            inner = _Scope(scope, False)
+        else:
+            self._mutable_defaults(node.args)
+            stack.extend((default, scope, False)
+                         for default in node.args.defaults + [d for d in node.args.kw_defaults if d is not None])
+            inner = _Scope(scope, True)
+        # Pushed before the body, so the scope is finished only after everything in it has been visited
+        stack.append((None, inner, False))
+        stack.extend((statement, inner, False) for statement in node.body)
+
+    def _mutable_defaults(self, args: ast.arguments):
+        for default in args.defaults + [d for d in args.kw_defaults if d is not None]:
+            if _is_mutable(default):
+                self.bugs.append({"line": default.lineno, "check": "mutable-default",
+                                  "description": "Mutable default argument is shared between calls; "
+                                                 "default to None and create it in the body."})
+
+    def _except_handler(self, node: ast.ExceptHandler, scope: _Scope):
+        if node.type is None:
+            scope.guarded = True
+            self.comments.append({"line": node.lineno, "check": "bare-except",
+                                  "comment": "Bare 'except:' also catches KeyboardInterrupt and SystemExit; "
+                                             "catch Exception or a narrower type."})
+            return
+        names = {n.id if isinstance(n, ast.Name) else n.attr
+                 for n in ast.walk(node.type) if isinstance(n, (ast.Name, ast.Attribute))}
+        if names & {"ZeroDivisionError", "ArithmeticError", "Exception", "BaseException"}:
+            scope.guarded = True
+
+    def _finish(self, scope: _Scope):
+        for line, divisor in scope.divisions:
+            if _is_zero(divisor):
+                self.bugs.append({"line": line, "check": "division-by-zero", "description": "Division by zero."})
+            elif isinstance(divisor, ast.Name) and not scope.guarded and divisor.id not in scope.checked \
+                    and divisor.id not in scope.constants:
+                self.bugs.append({"line": line, "check": "possible-division-by-zero",
+                                  "description": f"Possible division by zero: '{divisor.id}' is never checked "
+                                                 f"before it is used as a divisor."})
+        if not scope.is_function or {"locals", "vars"} & scope.loaded:
+            return
+        for name, line in scope.assigned.items():
+            if name not in scope.loaded and name not in scope.declared and not name.startswith('_'):
+                self.bugs.append({"line": line, "check": "unused-variable",
+                                  "description": f"Local variable '{name}' is assigned but never used."})
+
+
+def analyze_tree(tree: ast.Module) -> Dict[str, List[Dict[str, Any]]]:
+    """Run every check on a parsed module and return review comments and bugs sorted by line."""
+    return _Analyzer().run(tree)
+
+
+def analyze_source(code: str, cache: Optional[ParseCache] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Parse (through the cache) and analyze Python source; syntax errors are reported as a bug."""
+    try:
+        _, tree = (cache or parse_cache).parse(code)
+    except SyntaxError as e:
+        return {"review_comments": [], "bugs": [{"line": e.lineno, "check": "syntax-error",
+                                                 "description": f"Syntax error: {e.msg}"}]}
+    except RecursionError:
+        # CPython's own parser recurses, so an expression of thousands of terms cannot be parsed at all
+        return {"review_comments": [], "bugs": [{"line": 1, "check": "analysis-error",
+                                                 "description": "Source is nested too deeply to analyze."}]}
+    return analyze_tree(tree)
+
+
+def analyze_file(item: Tuple[str, str]) -> Tuple[str, Dict[str, List[Dict[str, Any]]]]:
+    """Process-pool entry point: analyze one (path, code) pair."""
+    path, code = item
+    return path, analyze_source(code)
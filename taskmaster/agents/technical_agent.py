@@ -1,21 +1,45 @@
 # taskmaster_ai/src/agents/technical_agent.py
 
 import logging
-from typing import Dict, Any
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional
+from taskmaster.agents.code_analysis import ParseCache, analyze_file, analyze_source, content_hash
 from taskmaster.core.engine import Task, TaskResult
 
 class TechnicalAgent:
-    def __init__(self):
+    """Code generation plus static analysis of Python source with the stdlib ``ast`` module.
+
+    Analysis results are cached by content hash, so unchanged files are never re-analyzed.
+    Multi-file inputs (``input_data['files']``, a mapping of path to source) larger than
+    ``parallel_threshold`` files are analyzed on a process pool, since parsing is CPU-bound.
+    Other languages are not analyzed: their results have no findings and ``analyzed`` set to False.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, parallel_threshold: int = 16,
+                 cache_size: int = 4096):
         self.logger = logging.getLogger('TechnicalAgent')
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.cache_size = cache_size
+        self.parse_cache = ParseCache(cache_size)
+        # Content hash -> analysis, least recently used first
+        self._results: "OrderedDict[str, Dict[str, List[Dict[str, Any]]]]" = OrderedDict()
 
     def process_task(self, task: Task) -> Dict[str, Any]:
         try:
+            language = task.parameters.get('language', 'python')
             if task.task_type == "code_generation":
-                return self.generate_code(task.input_data['requirements'], task.parameters.get('language', 'python'))
+                return self.generate_code(task.input_data['requirements'], language)
             elif task.task_type == "code_review":
-                return self.review_code(task.input_data['code'], task.parameters.get('language', 'python'))
+                if 'files' in task.input_data:
+                    return self.review_files(task.input_data['files'], language)
+                return self.review_code(task.input_data['code'], language)
             elif task.task_type == "bug_identification":
-                return self.identify_bugs(task.input_data['code'], task.parameters.get('language', 'python'))
+                if 'files' in task.input_data:
+                    return self.identify_bugs_in_files(task.input_data['files'], language)
+                return self.identify_bugs(task.input_data['code'], language)
             else:
                 raise ValueError(f"Unsupported task type: {task.task_type}")
         except Exception as e:
@@ -27,18 +51,76 @@ class TechnicalAgent:
         generated_code = f"def main():\n    # TODO: Implement {requirements}\n    pass"
         return {"code": generated_code, "language": language}
 
+    def _supports(self, language: str) -> bool:
+        if language.lower() == "python":
+            return True
+        self.logger.warning(f"Static analysis is not supported for language {language}; returning no findings")
+        return False
+
+    def analyze(self, code: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the review comments and bugs for one Python source, reusing cached results."""
+        digest = content_hash(code)
+        analysis = self._results.get(digest)
+        if analysis is not None:
+            self._results.move_to_end(digest)
+        else:
+            analysis = analyze_source(code, self.parse_cache)
+            self._remember(digest, analysis)
+        return analysis
+
+    def _remember(self, digest: str, analysis: Dict[str, List[Dict[str, Any]]]):
+        self._results[digest] = analysis
+        self._results.move_to_end(digest)
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+
+    def analyze_files(self, files: Dict[str, str]) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """Analyze many files, in parallel when there are more than parallel_threshold uncached ones."""
+        results = {}
+        pending = {}
+        for path, code in files.items():
+            digest = content_hash(code)
+            cached = self._results.get(digest)
+            if cached is not None:
+                results[path] = cached
+            else:
+                pending[path] = (digest, code)
+        if len(pending) > self.parallel_threshold and self.max_workers > 1:
+            items = [(path, code) for path, (_, code) in pending.items()]
+            # Large chunks amortize the pickling round-trip; small files take well under a millisecond
+            chunksize = max(1, len(items) // (self.max_workers * 4))
+            # A pool per batch: start-up is small next to a batch this size, and no workers outlive the call
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                for path, analysis in executor.map(analyze_file, items, chunksize=chunksize):
+                    results[path] = analysis
+                    self._remember(pending[path][0], analysis)
+        else:
+            for path, (digest, code) in pending.items():
+                results[path] = analyze_source(code, self.parse_cache)
+                self._remember(digest, results[path])
+        return {path: results[path] for path in files}
+
     def review_code(self, code: str, language: str) -> Dict[str, Any]:
-        # Placeholder for code review
-        review_comments = [
-            {"line": 1, "comment": "Consider adding a docstring to explain the function's purpose."},
-            {"line": 3, "comment": "This variable name could be more descriptive."}
-        ]
-        return {"review_comments": review_comments, "language": language}
+        if not self._supports(language):
+            return {"review_comments": [], "language": language, "analyzed": False}
+        return {"review_comments": list(self.analyze(code)["review_comments"]), "language": language}
 
     def identify_bugs(self, code: str, language: str) -> Dict[str, Any]:
-        # Placeholder for bug identification
-        bugs = [
-            {"line": 5, "description": "Potential division by zero error."},
-            {"line": 10, "description": "Unused variable 'result'."}
-        ]
-        return {"bugs": bugs, "language": language}
\ No newline at end of file
+        if not self._supports(language):
+            return {"bugs": [], "language": language, "analyzed": False}
+        return {"bugs": list(self.analyze(code)["bugs"]), "language": language}
+
+    def review_files(self, files: Dict[str, str], language: str) -> Dict[str, Any]:
+        if not self._supports(language):
+            return {"review_comments": [], "files_analyzed": 0, "language": language, "analyzed": False}
+        analyses = self.analyze_files(files)
+        comments = [dict(comment, file=path) for path, analysis in analyses.items()
+                    for comment in analysis["review_comments"]]
+        return {"review_comments": comments, "files_analyzed": len(files), "language": language}
+
+    def identify_bugs_in_files(self, files: Dict[str, str], language: str) -> Dict[str, Any]:
+        if not self._supports(language):
+            return {"bugs": [], "files_analyzed": 0, "language": language, "analyzed": False}
+        analyses = self.analyze_files(files)
+        bugs = [dict(bug, file=path) for path, analysis in analyses.items() for bug in analysis["bugs"]]
+        return {"bugs": bugs, "files_analyzed": len(files), "language": language}
@@ -0,0 +1,257 @@
+# taskmaster/bench/benchmarks.py
+
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from taskmaster.core.engine import CoreEngine
+from taskmaster.memory.memory_manager import SHORT_TERM, MemoryManager
+from taskmaster.models import Task, TaskResult
+from taskmaster.monitoring.metrics import MetricsRegistry
+from taskmaster.monitoring.tracing import Tracer
+from taskmaster.orchestrator.orchestrator import Orchestrator
+
+logger = logging.getLogger('Benchmarks')
+
+DEFAULT_DAG_SIZES = (10, 100, 1000, 10000, 100000)
+# --quick caps every DAG at this many tasks
+QUICK_MAX_DAG_SIZE = 1000
+DAG_SHAPES = ("chain", "fan_out", "layered")
+ENGINE_TASK_TYPES = {
+    "summarization": {"text": "TaskMaster benchmarks measure throughput of the summarization agent. " * 4},
+    "sentiment_analysis": {"text": "I love how fast this is."},
+    "named_entity_recognition": {"text": "John Doe works at OpenAI."}
+}
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall-clock time of ``repeat`` runs, like ``timeit``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _result(suite: str, name: str, params: Dict[str, Any], ops: int, seconds: float) -> Dict[str, Any]:
+    return {
+        "suite": suite,
+        "name": name,
+        "params": params,
+        "ops": ops,
+        "seconds": seconds,
+        "ops_per_sec": ops / seconds if seconds > 0 else float("inf")
+    }
+
+
+def bench_memory(ops: int = 1000, repeat: int = 3) -> List[Dict[str, Any]]:
+    """Measure MemoryManager write and read throughput per backend, with and without the read cache."""
+    results = []
+    payload = {"summary": "x" * 256, "confidence": 0.5}
+    keys = [f"key-{i}" for i in range(ops)]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        backends = {
+            "sqlite_memory": (":memory:", 1),
+            "sqlite_file": (os.path.join(tmp_dir, "bench.db"), 1),
+            "sqlite_file_sharded": (os.path.join(tmp_dir, "bench_sharded.db"), 4)
+        }
+        for backend, (db_path, shards) in backends.items():
+            manager = MemoryManager(db_path, metrics_registry=MetricsRegistry(), shards=shards)
+
+            def write_all():
+                for key in keys:
+                    manager.store_data(key, payload)
+
+            def write_concurrent():
+                # Parallel workers only scale when their writes land on different shard locks
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    list(executor.map(lambda key: manager.store_data(key, payload), keys))
+
+            def read_cached():
+                manager._invalidate()
+                for key in keys:
+                    manager.get_data(key)
+                    manager.get_data(key)
+
+            def read_uncached():
+                for key in keys:
+                    manager._load_data(key, SHORT_TERM)
+                    manager._load_data(key, SHORT_TERM)
+
+            results.append(_result("memory", "write", {"backend": backend}, ops, _measure(write_all, repeat)))
+            results.append(_result("memory", "write_concurrent", {"backend": backend, "threads": 4},
+                                   ops, _measure(write_concurrent, repeat)))
+            results.append(_result("memory", "read", {"backend": backend, "cache": True},
+                                   2 * ops, _measure(read_cached, repeat)))
+            results.append(_result("memory", "read", {"backend": backend, "cache": False},
+                                   2 * ops, _measure(read_uncached, repeat)))
+            manager.close()
+    return results
+
+
+def bench_engine(tasks_per_type: int = 500, repeat: int = 3) -> List[Dict[str, Any]]:
+    """Measure CoreEngine.process_task throughput for each agent task type."""
+    results = []
+    engine = CoreEngine(metrics_registry=MetricsRegistry(), tracer=Tracer())
+    for task_type, input_data in ENGINE_TASK_TYPES.items():
+        tasks = [Task(f"{task_type}-{i}", task_type, input_data, {}) for i in range(tasks_per_type)]
+        engine.register_agent(task_type)
+
+        def run_all():
+            for task in tasks:
+                engine.process_task(task)
+
+        results.append(_result("engine", "process_task", {"task_type": task_type},
+                               tasks_per_type, _measure(run_all, repeat)))
+    return results
+
+
+def make_dag(shape: str, size: int, seed: int = 0) -> Tuple[List[Task], Dict[str, List[str]]]:
+    """Build a synthetic workflow of ``size`` tasks.
+
+    Args:
+        shape (str): ``chain`` (each task depends on the previous one), ``fan_out`` (one root with
+            ``size - 1`` dependents) or ``layered`` (random edges between consecutive layers).
+        size (int): Number of tasks.
+        seed (int, optional): Seed for the layered generator. Defaults to 0.
+
+    Returns:
+        tuple: The task list and the dependency mapping.
+    """
+    task_ids = [str(i) for i in range(size)]
+    tasks = [Task(task_id, "noop", {}, {}) for task_id in task_ids]
+    dependencies: Dict[str, List[str]] = {}
+    if shape == "chain":
+        for i in range(1, size):
+            dependencies[task_ids[i]] = [task_ids[i - 1]]
+    elif shape == "fan_out":
+        for i in range(1, size):
+            dependencies[task_ids[i]] = [task_ids[0]]
+    elif shape == "layered":
+        rng = random.Random(seed)
+        width = max(1, int(size ** 0.5))
+        layers = [task_ids[i:i + width] for i in range(0, size, width)]
+        for previous, layer in zip(layers, layers[1:]):
+            for task_id in layer:
+                dependencies[task_id] = rng.sample(previous, min(len(previous), rng.randint(1, 3)))
+    else:
+        raise ValueError(f"Unknown DAG shape: {shape}")
+    return tasks, dependencies
+
+
+class _NoopEngine:
+    """Engine that completes every task immediately, isolating the orchestrator's own overhead."""
+
+    def __init__(self):
+        self.metrics = MetricsRegistry()
+        self.tracer = Tracer()
+
+    def process_task(self, task: Task) -> TaskResult:
+        return TaskResult(task.task_id, None, {"task_type": task.task_type})
+
+
+def bench_orchestrator(sizes: Sequence[int] = DEFAULT_DAG_SIZES, shapes: Sequence[str] = DAG_SHAPES,
+                       repeat: int = 1) -> List[Dict[str, Any]]:
+    """Measure workflow creation and scheduling overhead on synthetic DAGs."""
+    results = []
+    for shape in shapes:
+        for size in sizes:
+            tasks, dependencies = make_dag(shape, size)
+            orchestrator = Orchestrator(_NoopEngine(), db_path=':memory:')
+            workflow_id = f"{shape}-{size}"
+
+            def create():
+                orchestrator.create_workflow(workflow_id, tasks, dependencies)
+
+            def execute():
+                orchestrator.execute_workflow(workflow_id)
+
+            params = {"shape": shape, "size": size}
+            results.append(_result("orchestrator", "create_workflow", params, size, _measure(create, repeat)))
+            results.append(_result("orchestrator", "execute_workflow", params, size, _measure(execute, repeat)))
+    return results
+
+
+SUITES = {
+    "memory": bench_memory,
+    "engine": bench_engine,
+    "orchestrator": bench_orchestrator
+}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(suites: Sequence[str] = tuple(SUITES), dag_sizes: Sequence[int] = DEFAULT_DAG_SIZES,
+                   quick: bool = False) -> Dict[str, Any]:
+    """Run the selected suites and return a JSON-serializable report."""
+    results = []
+    for suite in suites:
+        if suite not in SUITES:
+            raise ValueError(f"Unknown benchmark suite: {suite}")
+        logger.info("Running %s benchmarks", suite)
+        if suite == "orchestrator":
+            sizes = sorted({min(size, QUICK_MAX_DAG_SIZE) for size in dag_sizes}) if quick else dag_sizes
+            results.extend(bench_orchestrator(sizes))
+        elif quick:
+            results.extend(SUITES[suite](100, repeat=1))
+        else:
+            results.extend(SUITES[suite]())
+    return {
+        "timestamp": time.time(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results
+    }
+
+
+def save_report(report: Dict[str, Any], path: str):
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _result_key(result: Dict[str, Any]) -> str:
+    return f"{result['suite']}.{result['name']}{json.dumps(result['params'], sort_keys=True)}"
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """Compare two reports and flag benchmarks whose throughput dropped by more than ``threshold``.
+
+    Returns:
+        list: One entry per benchmark present in both reports, with the relative change in ops/sec.
+    """
+    baseline_by_key = {_result_key(r): r for r in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        previous = baseline_by_key.get(_result_key(result))
+        if previous is None or not previous["ops_per_sec"]:
+            continue
+        change = result["ops_per_sec"] / previous["ops_per_sec"] - 1.0
+        comparison.append({
+            "benchmark": _result_key(result),
+            "baseline_ops_per_sec": previous["ops_per_sec"],
+            "ops_per_sec": result["ops_per_sec"],
+            "change": change,
+            "regression": change < -threshold
+        })
+    return comparison
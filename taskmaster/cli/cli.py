@@ -5,7 +5,9 @@ import os
 import argparse
 import json
 from taskmaster.core.engine import CoreEngine
+from taskmaster.logging_config import LEVELS, configure_logging
 from taskmaster.models import Task
+from taskmaster.monitoring.profiling import WorkflowProfiler
 
 class CLI:
     def __init__(self):
@@ -14,6 +16,10 @@ class CLI:
 
     def create_parser(self):
         parser = argparse.ArgumentParser(description="TaskMaster AI CLI")
+        parser.add_argument("--log-level", type=str.upper, choices=LEVELS, default=None,
+                            help="Logging level (default is $TASKMASTER_LOG_LEVEL or WARNING)")
+        parser.add_argument("--log-format", choices=["text", "json"], default="text", help="Log output format")
+        parser.add_argument("--log-file", type=str, default=None, help="Also write logs to this file")
         subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
         # Create workflow command
@@ -25,15 +31,42 @@ class CLI:
         # Execute workflow command
         execute_parser = subparsers.add_parser("execute", help="Execute a workflow")
         execute_parser.add_argument("workflow_id", type=str, help="Identifier of the workflow to execute")
+        execute_parser.add_argument("--profile", action="store_true",
+                                    help="Profile CPU time and allocations per task and function")
+        execute_parser.add_argument("--profile-output", type=str, default=None,
+                                    help="Profile report file (default is <workflow_id>_profile.json)")
+        execute_parser.add_argument("--follow", action="store_true",
+                                    help="Print each task result and status change as it happens")
 
         # Get workflow status command
         status_parser = subparsers.add_parser("status", help="Get the status of a workflow")
         status_parser.add_argument("workflow_id", type=str, help="Identifier of the workflow to check")
 
+        # Benchmark command
+        bench_parser = subparsers.add_parser("bench", help="Run performance benchmarks")
+        bench_parser.add_argument("--suite", action="append", choices=["memory", "engine", "orchestrator"],
+                                  help="Benchmark suite to run (repeatable, default is all)")
+        bench_parser.add_argument("--sizes", type=str, default="10,100,1000,10000,100000",
+                                  help="Comma-separated DAG sizes for the orchestrator suite "
+                                       "(default is 10,100,1000,10000,100000)")
+        bench_parser.add_argument("--quick", action="store_true",
+                                  help="Run fewer iterations and cap DAG sizes at 1000 tasks")
+        bench_parser.add_argument("--output", type=str, default="bench_results.json",
+                                  help="File to save the JSON results to (default is bench_results.json)")
+        bench_parser.add_argument("--compare", type=str, help="Baseline results file to compare against")
+        bench_parser.add_argument("--threshold", type=float, default=0.1,
+                                  help="Relative throughput drop reported as a regression (default is 0.1)")
+
         return parser
 
     def run(self):
         args = self.parser.parse_args()
+        try:
+            configure_logging(level=args.log_level, structured=args.log_format == "json", log_file=args.log_file)
+        except (ValueError, OSError) as e:
+            # An invalid $TASKMASTER_LOG_LEVEL or an unwritable log file
+            print(f"Error: {str(e)}")
+            return
 
         if args.command == "create":
             self.create_workflow(args)
@@ -41,6 +74,8 @@ class CLI:
             self.execute_workflow(args)
         elif args.command == "status":
             self.get_workflow_status(args)
+        elif args.command == "bench":
+            self.run_benchmarks(args)
         else:
             print("Invalid command. Use -h for help.")
 
@@ -64,7 +99,15 @@ class CLI:
 
     def execute_workflow(self, args):
         try:
-            results = self.core_engine.orchestrator.execute_workflow(args.workflow_id)
+            if args.follow:
+                self.follow_workflow(args)
+                return
+            if args.profile:
+                report_path = args.profile_output or f"{args.workflow_id}_profile.json"
+                results, saved = self.core_engine.orchestrator.profile_workflow(args.workflow_id, report_path)
+                self.print_report_status(saved, report_path)
+            else:
+                results = self.core_engine.orchestrator.execute_workflow(args.workflow_id)
             print(f"Workflow '{args.workflow_id}' execution results:")
             for task_id, result in results.items():
                 print(f"Task {task_id}: {result.result}")
@@ -73,6 +116,34 @@ class CLI:
         except Exception as e:
             print(f"Error executing workflow: {str(e)}")
 
+    def follow_workflow(self, args):
+        orchestrator = self.core_engine.orchestrator
+
+        def print_event(event):
+            if event["event"] == "task_status":
+                print(f"[{event['status']}] Task {event['task_id']}", flush=True)
+
+        subscription = orchestrator.subscribe(print_event, workflow_id=args.workflow_id)
+        try:
+            print(f"Workflow '{args.workflow_id}' execution results:", flush=True)
+            if args.profile:
+                report_path = args.profile_output or f"{args.workflow_id}_profile.json"
+                with WorkflowProfiler() as profiler:
+                    for task_id, result in orchestrator.stream_workflow(args.workflow_id, profiler=profiler):
+                        print(f"Task {task_id}: {result.result}", flush=True)
+                self.print_report_status(profiler.write_report(report_path, args.workflow_id), report_path)
+            else:
+                for task_id, result in orchestrator.stream_workflow(args.workflow_id):
+                    print(f"Task {task_id}: {result.result}", flush=True)
+        finally:
+            orchestrator.unsubscribe(subscription)
+
+    def print_report_status(self, saved, report_path):
+        if saved:
+            print(f"Profile report saved to {report_path}")
+        else:
+            print(f"Error: could not write profile report to {report_path}")
+
     def get_workflow_status(self, args):
         try:
             status = self.core_engine.orchestrator.get_workflow_status(args.workflow_id)
@@ -84,6 +155,30 @@ class CLI:
         except Exception as e:
             print(f"Error getting workflow status: {str(e)}")
 
+    def run_benchmarks(self, args):
+        from taskmaster.bench.benchmarks import compare_reports, load_report, run_benchmarks, save_report
+
+        try:
+            sizes = [int(size) for size in args.sizes.split(",") if size]
+            report = run_benchmarks(args.suite or ["memory", "engine", "orchestrator"], sizes, quick=args.quick)
+            save_report(report, args.output)
+            for result in report["results"]:
+                print(f"{result['suite']}.{result['name']} {result['params']}: "
+                      f"{result['ops_per_sec']:.1f} ops/sec ({result['seconds']:.4f}s)")
+            print(f"Benchmark results saved to {args.output}")
+
+            if args.compare:
+                regressions = 0
+                for entry in compare_reports(load_report(args.compare), report, args.threshold):
+                    marker = "REGRESSION" if entry["regression"] else "ok"
+                    regressions += entry["regression"]
+                    print(f"{entry['benchmark']}: {entry['change']:+.1%} [{marker}]")
+                if regressions:
+                    print(f"{regressions} benchmark(s) regressed by more than {args.threshold:.0%}")
+                    sys.exit(1)
+        except (ValueError, OSError) as e:
+            print(f"Error: {str(e)}")
+
     def validate_tasks(self, tasks_json):
         try:
             tasks = json.loads(tasks_json)
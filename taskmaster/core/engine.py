@@ -1,9 +1,12 @@
 # taskmaster/core/engine.py
 
 import logging
-from typing import Dict, Any, List
+import time
+from typing import Dict, Any, List, Optional
 from taskmaster.models import Task, TaskResult
-from taskmaster.memory.memory_manager import MemoryManager
+from taskmaster.memory.memory_manager import RESULT, MemoryManager
+from taskmaster.memory.retrieval import text_of
+from taskmaster.monitoring import metrics, tracing
 from taskmaster.orchestrator.orchestrator import Orchestrator
 
 class AgentFactory:
@@ -19,10 +22,25 @@ class AgentFactory:
             raise ValueError(f"Unsupported agent type: {agent_type}")
 
 class CoreEngine:
-    def __init__(self):
+    def __init__(self, metrics_registry: Optional[metrics.MetricsRegistry] = None,
+                 tracer: Optional[tracing.Tracer] = None, memory_manager: Optional[MemoryManager] = None,
+                 result_ttl: Optional[float] = None, related_context: int = 5):
         self.logger = logging.getLogger('CoreEngine')
+        self.result_ttl = result_ttl
+        # Number of relevant prior results passed to agents when the memory manager has a search index
+        self.related_context = related_context
         self.agent_registry = {}
-        self.memory_manager = MemoryManager()
+        self.metrics = metrics_registry or metrics.registry
+        self.tracer = tracer or tracing.tracer
+        self._queue_wait = self.metrics.histogram(
+            'taskmaster_task_queue_wait_seconds', 'Time a task waited between becoming ready and starting')
+        self._agent_latency = self.metrics.histogram(
+            'taskmaster_agent_execution_seconds', 'Time spent inside agent.process_task')
+        self._task_latency = self.metrics.histogram(
+            'taskmaster_task_processing_seconds', 'End-to-end CoreEngine.process_task latency')
+        self._tasks_total = self.metrics.counter('taskmaster_tasks', 'Tasks processed by outcome')
+        self._tasks_in_progress = self.metrics.gauge('taskmaster_tasks_in_progress', 'Tasks currently being processed')
+        self.memory_manager = memory_manager or MemoryManager(metrics_registry=self.metrics)
         self.orchestrator = Orchestrator(self)
 
     def register_agent(self, agent_type: str):
@@ -30,22 +48,48 @@ class CoreEngine:
             self.agent_registry[agent_type] = AgentFactory.create_agent(agent_type)
 
     def process_task(self, task: Task) -> TaskResult:
+        start = time.perf_counter()
+        enqueued_at = getattr(task, 'enqueued_at', None)
+        if enqueued_at is not None:
+            self._queue_wait.observe(max(time.time() - enqueued_at, 0.0), task_type=task.task_type)
+        self._tasks_in_progress.inc()
+        try:
+            with self.tracer.span("process_task", task_id=task.task_id, task_type=task.task_type):
+                task_result = self._process_task(task)
+        finally:
+            self._tasks_in_progress.dec()
+        status = "error" if "error" in task_result.metadata else "success"
+        self._tasks_total.inc(task_type=task.task_type, status=status)
+        self._task_latency.observe(time.perf_counter() - start, task_type=task.task_type)
+        return task_result
+
+    def _process_task(self, task: Task) -> TaskResult:
         try:
             if task.task_type not in self.agent_registry:
                 self.register_agent(task.task_type)
 
             agent = self.agent_registry[task.task_type]
             
-            # Retrieve context from memory
-            context = self.memory_manager.get_data(task.task_id) or {}
+            # Retrieve context from memory: the result this task stored on a previous run
+            context = self.memory_manager.get_data(task.task_id, namespace=RESULT) or {}
             
             # Add context to task parameters
             task.parameters['context'] = context
+            if self.related_context and self.memory_manager.search_index is not None:
+                related = self.memory_manager.search(text_of(task.input_data), k=self.related_context + 1)
+                task.parameters['related_context'] = [
+                    item for item in related if item["key"] != task.task_id][:self.related_context]
             
-            result = agent.process_task(task)
+            try:
+                with self._agent_latency.time(task_type=task.task_type):
+                    result = agent.process_task(task)
+            finally:
+                # Context and related results are only input for this run; keep them out of persisted workflows
+                task.parameters.pop('context', None)
+                task.parameters.pop('related_context', None)
             
             # Store result in memory
-            self.memory_manager.store_data(task.task_id, result)
+            self.memory_manager.store_data(task.task_id, result, ttl=self.result_ttl, namespace=RESULT)
             
             return TaskResult(task.task_id, result, {"task_type": task.task_type})
         except Exception as e:
@@ -1,6 +1,18 @@
 # taskmaster/interfaces/ai_model_interface.py
 
-from typing import Dict
+import hashlib
+import http.client
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+from taskmaster.monitoring.metrics import MetricsRegistry, registry
 
 class MockAIModel:
     def generate_text(self, prompt: str) -> str:
@@ -9,4 +21,294 @@ class MockAIModel:
     def classify_text(self, text: str) -> Dict[str, float]:
         return {"positive": 0.8, "negative": 0.2}
 
-ai_model = MockAIModel()
\ No newline at end of file
+class ModelError(Exception):
+    """Raised when a model backend returns an error response."""
+
+class HTTPModelBackend:
+    """Model backend that speaks JSON over HTTP with a bounded pool of keep-alive connections.
+
+    ``POST /generate`` takes ``{"prompt": ...}`` and returns ``{"text": ...}``;
+    ``POST /classify`` takes ``{"text": ...}`` and returns ``{"scores": {...}}``.
+
+    Args:
+        base_url (str): Server address, e.g. ``http://127.0.0.1:8080``.
+        pool_size (int, optional): Maximum number of open connections. Defaults to 4.
+        timeout (float, optional): Socket timeout in seconds. Defaults to 30.
+        name (str, optional): Model name, part of the response cache key. Defaults to base_url.
+    """
+
+    def __init__(self, base_url: str, pool_size: int = 4, timeout: float = 30.0, name: Optional[str] = None):
+        self.logger = logging.getLogger('HTTPModelBackend')
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.https = parts.scheme == 'https'
+        self.base_path = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.name = name or base_url
+        self.pool_size = pool_size
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    @contextmanager
+    def _connection(self) -> Iterator[http.client.HTTPConnection]:
+        # The semaphore bounds open connections; idle ones are reused most-recently-used first
+        with self._slots:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._new_connection()
+            try:
+                yield connection
+            except Exception:
+                connection.close()
+                raise
+            self._idle.put(connection)
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        body = json.dumps(payload).encode('utf-8')
+        for attempt in range(2):
+            try:
+                with self._connection() as connection:
+                    connection.request('POST', f"{self.base_path}{path}", body=body,
+                                       headers={'Content-Type': 'application/json'})
+                    response = connection.getresponse()
+                    data = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # A pooled keep-alive connection may have been closed by the server; retry once on a fresh one
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise ModelError(f"{path} returned HTTP {response.status}: {data[:200]!r}")
+        return json.loads(data)
+
+    def generate_text(self, prompt: str) -> str:
+        return self._post('/generate', {"prompt": prompt})["text"]
+
+    def classify_text(self, text: str) -> Dict[str, float]:
+        return self._post('/classify', {"text": text})["scores"]
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class ResponseCache:
+    """Persistent prompt -> response cache in SQLite with least-recently-used eviction.
+
+    Args:
+        db_path (str, optional): SQLite file; the default in-memory database lasts for the process.
+        max_entries (int, optional): Entries kept before the least recently used are evicted. Defaults to 10000.
+        ttl (float, optional): Seconds a response stays valid; None keeps it until evicted.
+    """
+
+    def __init__(self, db_path: str = ':memory:', max_entries: int = 10000, ttl: Optional[float] = None):
+        self.logger = logging.getLogger('ResponseCache')
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(model: str, operation: str, prompt: str) -> str:
+        return hashlib.sha256(f"{model}\0{operation}\0{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.ttl is not None and row[1] + self.ttl <= now):
+                self.misses += 1
+                return None
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, response: Any):
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(response), now, now))
+            excess = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                self.conn.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used LIMIT ?)",
+                    (excess,))
+                self.evictions += excess
+            self.conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def report(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+class TokenBucket:
+    """Token-bucket rate limiter: ``rate`` tokens per second, bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, not {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available and return 0, otherwise return the seconds until they will be.
+
+        Raises:
+            ValueError: If tokens exceeds the capacity, since the bucket could never hold that many.
+        """
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket of capacity {self.capacity}")
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, timeout: Optional[float] = None) -> bool:
+        """Block until tokens are available; returns False if that would take longer than timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+class ModelClient:
+    """Caching, coalescing, rate-limited front end for a model backend.
+
+    Calls run on a bounded worker pool. Identical requests already in flight share one
+    backend call. Completed responses go to the ResponseCache, and every backend call first
+    takes a token from the rate limiter. ``generate_text`` and ``classify_text`` block like
+    MockAIModel's, so the client is a drop-in replacement; ``submit`` returns a Future.
+
+    Args:
+        backend: Object with ``generate_text`` and ``classify_text``, e.g. HTTPModelBackend.
+        cache (ResponseCache, optional): Response cache; None disables caching.
+        rate_limiter (TokenBucket, optional): Limits backend calls; None means unlimited.
+        max_workers (int, optional): Maximum concurrent backend calls. Defaults to 4.
+        metrics_registry (MetricsRegistry, optional): Where call metrics are recorded.
+    """
+
+    OPERATIONS = ("generate_text", "classify_text")
+
+    def __init__(self, backend, cache: Optional[ResponseCache] = None, rate_limiter: Optional[TokenBucket] = None,
+                 max_workers: int = 4, metrics_registry: Optional[MetricsRegistry] = None):
+        self.logger = logging.getLogger('ModelClient')
+        self.backend = backend
+        self.model = getattr(backend, 'name', type(backend).__name__)
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='model-client')
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.backend_calls = 0
+        self.coalesced = 0
+        metrics = metrics_registry or registry
+        self._call_latency = metrics.histogram('taskmaster_model_call_seconds', 'Latency of model backend calls')
+        self._requests = metrics.counter('taskmaster_model_requests', 'Model requests by how they were served')
+
+    def submit(self, operation: str, prompt: str) -> Future:
+        if operation not in self.OPERATIONS:
+            raise ValueError(f"Unknown model operation: {operation}")
+        key = ResponseCache.make_key(self.model, operation, prompt)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._requests.inc(operation=operation, source='cache')
+                future = Future()
+                future.set_result(cached)
+                return future
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                self._requests.inc(operation=operation, source='coalesced')
+                return future
+            future = self._executor.submit(self._call, operation, prompt, key)
+            self._inflight[key] = future
+        self._requests.inc(operation=operation, source='backend')
+        future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _call(self, operation: str, prompt: str, key: str) -> Any:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+        with self._call_latency.time(operation=operation):
+            response = getattr(self.backend, operation)(prompt)
+        with self._lock:
+            self.backend_calls += 1
+        # Cache before the future resolves so a request arriving just after coalescing ends still hits
+        if self.cache is not None:
+            self.cache.put(key, response)
+        return response
+
+    def generate_text(self, prompt: str, timeout: Optional[float] = None) -> str:
+        return self.submit("generate_text", prompt).result(timeout)
+
+    def classify_text(self, text: str, timeout: Optional[float] = None) -> Dict[str, float]:
+        return self.submit("classify_text", text).result(timeout)
+
+    def report(self) -> Dict[str, Any]:
+        """Cache hit rate plus how many requests reached the backend or were coalesced."""
+        report = self.cache.report() if self.cache is not None else {}
+        report.update({"backend_calls": self.backend_calls, "coalesced": self.coalesced})
+        return report
+
+    def close(self):
+        self._executor.shutdown()
+        if self.cache is not None:
+            self.cache.close()
+        if hasattr(self.backend, 'close'):
+            self.backend.close()
+
+ai_model = MockAIModel()
@@ -1,3 +1,130 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+from collections.abc import Mapping
+from typing import Optional
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
\ No newline at end of file
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DEFAULT_LEVEL = 'WARNING'
+LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+LEVEL_ENV_VAR = 'TASKMASTER_LOG_LEVEL'
+
+# Attributes present on every LogRecord; anything else was passed via ``extra=`` and is emitted as a field.
+_RESERVED_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+# Log arguments of these types cannot change between the logging call and the listener formatting them
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+_root_handler: Optional[logging.Handler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, including any ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueues records untouched so message formatting happens on the listener thread, not on workers.
+
+    Only records whose arguments are all immutable scalars are deferred; any other record (a
+    dependencies dict, say) is formatted before it is queued, so later mutation cannot change it.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args.values() if isinstance(record.args, Mapping) else record.args or ()
+        if all(isinstance(arg, _SCALAR_TYPES) for arg in args):
+            return record
+        return super().prepare(record)
+
+
+class _FanOutHandler(logging.Handler):
+    def __init__(self, handlers):
+        super().__init__()
+        self.handlers = handlers
+
+    def emit(self, record: logging.LogRecord):
+        for handler in self.handlers:
+            handler.handle(record)
+
+    def close(self):
+        for handler in self.handlers:
+            handler.close()
+        super().close()
+
+
+def configure_logging(level: Optional[str] = None, structured: bool = False, log_file: Optional[str] = None,
+                      asynchronous: bool = True) -> logging.Logger:
+    """Configure the root logger for taskmaster entry points.
+
+    Args:
+        level (str, optional): Level name; defaults to ``$TASKMASTER_LOG_LEVEL`` or WARNING.
+        structured (bool, optional): Emit JSON lines instead of plain text. Defaults to False.
+        log_file (str, optional): Also write logs to this file.
+        asynchronous (bool, optional): Hand records to a background thread through a queue so log I/O
+            never blocks the caller. Defaults to True.
+
+    Returns:
+        logging.Logger: The configured root logger.
+
+    Raises:
+        ValueError: If the level is not one of LEVELS; nothing is changed in that case.
+    """
+    global _root_handler, _listener
+    level_name = (level or os.environ.get(LEVEL_ENV_VAR) or DEFAULT_LEVEL).upper()
+    if level_name not in LEVELS:
+        raise ValueError(f"Unknown log level {level_name!r}; expected one of {', '.join(LEVELS)}")
+    shutdown_logging()
+
+    formatter = StructuredFormatter() if structured else logging.Formatter(DEFAULT_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    if asynchronous:
+        log_queue = queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(log_queue, *handlers)
+        _listener.start()
+        _root_handler = _DeferredQueueHandler(log_queue)
+    else:
+        _root_handler = handlers[0] if len(handlers) == 1 else _FanOutHandler(handlers)
+
+    root = logging.getLogger()
+    root.setLevel(level_name)
+    root.addHandler(_root_handler)
+    return root
+
+
+def shutdown_logging():
+    """Flush pending records and remove the handlers installed by ``configure_logging``."""
+    global _root_handler, _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    if _root_handler is not None:
+        logging.getLogger().removeHandler(_root_handler)
+        _root_handler.close()
+        _root_handler = None
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,98 @@
+# taskmaster/memory/blob_store.py
+
+import hashlib
+import logging
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+
+class BlobStore:
+    """Content-addressed store for large values.
+
+    Blobs are named by the SHA-256 of their content, so identical values are written once.
+    They live in ``<root>/<first two hex chars>/<digest>``. ``open`` maps a blob so it can be
+    decoded without first reading the file into a Python bytes object.
+    """
+
+    def __init__(self, root: str):
+        self.logger = logging.getLogger('BlobStore')
+        self.root = root
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if os.path.exists(path):
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temp file and rename so readers never observe a partial blob
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """Return the blob's content, or None if it does not exist."""
+        try:
+            with open(self._path(digest), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    @contextmanager
+    def open(self, digest: str) -> Iterator[Optional[memoryview]]:
+        """Map the blob and yield a read-only view over it, or None if it does not exist.
+
+        The mapping is closed on exit, so the view must not be kept beyond the block.
+        """
+        try:
+            f = open(self._path(digest), 'rb')
+        except FileNotFoundError:
+            yield None
+            return
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                yield memoryview(b'')
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                yield view
+
+    def exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def delete(self, digest: str) -> bool:
+        try:
+            os.unlink(self._path(digest))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def digests(self) -> Iterator[str]:
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.listdir(self.root):
+            prefix_dir = os.path.join(self.root, prefix)
+            if len(prefix) != 2 or not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                if not name.startswith('.tmp-'):
+                    yield name
+
+    def collect_garbage(self, live_digests: Iterable[str]) -> int:
+        """Delete every blob not in ``live_digests`` and return how many were removed."""
+        live = set(live_digests)
+        removed = 0
+        for digest in list(self.digests()):
+            if digest not in live and self.delete(digest):
+                removed += 1
+        return removed
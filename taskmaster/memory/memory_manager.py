@@ -1,77 +1,545 @@
 # taskmaster_ai/src/memory/memory_manager.py
 
 import logging
-from typing import Dict, Any, Optional
-from functools import lru_cache
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager, nullcontext
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 import sqlite3
 import json
+import threading
+import time
+import zlib
+from taskmaster.memory.blob_store import BlobStore
+from taskmaster.monitoring.metrics import MetricsRegistry, registry
 
-class MemoryManager:
-    def __init__(self, db_path: str = ':memory:'):
-        self.logger = logging.getLogger('MemoryManager')
+DEFAULT_SPILL_THRESHOLD = 64 * 1024
+
+SHORT_TERM = 'short_term'
+LONG_TERM = 'long_term'
+WORKFLOW = 'workflow'
+RESULT = 'result'
+NAMESPACES = (SHORT_TERM, LONG_TERM, WORKFLOW, RESULT)
+
+class RetentionPolicy:
+    """Limits on how long and how many rows a MemoryManager keeps.
+
+    Args:
+        default_ttl (float, optional): Seconds a value lives when store_data is not given a ttl; None keeps it forever.
+        namespace_ttls (dict, optional): Per-namespace TTLs that take precedence over default_ttl.
+        max_rows (int, optional): Keep at most this many rows, evicting the oldest first. Enforced per shard,
+            each shard keeping its even share.
+        sweep_interval (float, optional): Seconds between background sweeps. Defaults to 60.
+        batch_size (int, optional): Rows deleted per transaction, so sweeps never hold the write lock for long.
+        vacuum_pages (int, optional): Free pages returned to the file system after each sweep that deleted rows.
+            A database created before incremental vacuuming is rebuilt with one full VACUUM on its first sweep.
+    """
+
+    def __init__(self, default_ttl: Optional[float] = None, max_rows: Optional[int] = None,
+                 sweep_interval: float = 60.0, batch_size: int = 500, vacuum_pages: int = 1000,
+                 namespace_ttls: Optional[Dict[str, Optional[float]]] = None):
+        self.default_ttl = default_ttl
+        self.namespace_ttls = namespace_ttls or {}
+        self.max_rows = max_rows
+        self.sweep_interval = sweep_interval
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+
+    def ttl_for(self, namespace: str) -> Optional[float]:
+        return self.namespace_ttls.get(namespace, self.default_ttl)
+
+class MemoryShard:
+    """One SQLite database holding a slice of the keyspace, with its own connection and write lock."""
+
+    def __init__(self, db_path: str):
+        self.logger = logging.getLogger('MemoryShard')
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path)
+        # The connection is shared between worker and sweeper threads; every use goes through this lock
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
         self._create_table()
 
     def _create_table(self):
         try:
             cursor = self.conn.cursor()
+            # Only takes effect for a new database; existing ones are converted by their first compact()
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS memory (
-                    key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL DEFAULT 'short_term',
+                    key TEXT NOT NULL,
                     value TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    blob TEXT,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
                 )
             ''')
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(memory)")}
+            if 'blob' not in columns:
+                cursor.execute("ALTER TABLE memory ADD COLUMN blob TEXT")
+            if 'expires_at' not in columns:
+                cursor.execute("ALTER TABLE memory ADD COLUMN expires_at REAL")
+            if 'namespace' not in columns:
+                self._migrate_to_namespaces(cursor)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_timestamp ON memory (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_memory_expires_at ON memory (expires_at)")
+            cursor.execute("CREATE TABLE IF NOT EXISTS memory_meta (name TEXT PRIMARY KEY, value TEXT)")
             self.conn.commit()
         except Exception as e:
             self.logger.error(f"Error creating table: {str(e)}")
 
-    def store_data(self, key: str, data: Dict[str, Any]) -> bool:
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "INSERT OR REPLACE INTO memory (key, value) VALUES (?, ?)",
-                (key, json.dumps(data))
+    def _migrate_to_namespaces(self, cursor):
+        # The primary key changes, so the table has to be rebuilt; existing rows land in short_term
+        cursor.execute('''
+            CREATE TABLE memory_namespaced (
+                namespace TEXT NOT NULL DEFAULT 'short_term',
+                key TEXT NOT NULL,
+                value TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                blob TEXT,
+                expires_at REAL,
+                PRIMARY KEY (namespace, key)
             )
+        ''')
+        cursor.execute('''
+            INSERT INTO memory_namespaced (namespace, key, value, timestamp, blob, expires_at)
+            SELECT 'short_term', key, value, timestamp, blob, expires_at FROM memory
+        ''')
+        cursor.execute("DROP TABLE memory")
+        cursor.execute("ALTER TABLE memory_namespaced RENAME TO memory")
+
+    def get_meta(self, name: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM memory_meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str):
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO memory_meta (name, value) VALUES (?, ?)", (name, value))
             self.conn.commit()
-            return True
+
+    def delete_in_batches(self, where: str, params: tuple, batch_size: int, order_by: str = '',
+                          limit: Optional[int] = None) -> int:
+        """Delete matching rows batch_size at a time, releasing the lock between batches."""
+        deleted = 0
+        while limit is None or deleted < limit:
+            batch = batch_size if limit is None else min(batch_size, limit - deleted)
+            with self.lock:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    f"DELETE FROM memory WHERE rowid IN (SELECT rowid FROM memory WHERE {where} {order_by} LIMIT ?)",
+                    params + (batch,)
+                )
+                self.conn.commit()
+                count = cursor.rowcount
+            deleted += count
+            if count < batch:
+                break
+        return deleted
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class MemoryManager:
+    """Namespaced key-value memory, hash-sharded across SQLite databases.
+
+    Keys live in one of NAMESPACES, so task results, workflow definitions and agent context no
+    longer collide. Each (namespace, key) pair hashes to one of ``shards`` databases, each with
+    its own connection and write lock, so writers to different shards do not serialize.
+    Shard 0 is ``db_path`` itself and shard ``i`` is ``<db_path>.shard<i>``.
+
+    An optional ``search_index`` (see taskmaster.memory.retrieval.MemoryIndex) is kept in step
+    with writes so stored values can be found by keyword or similarity with ``search``.
+
+    The last ``read_cache_size`` values read are cached in process. Writes and deletes invalidate
+    their entries and a cached value is dropped once it expires; 0 disables the cache.
+    """
+
+    def __init__(self, db_path: str = ':memory:', metrics_registry: Optional[MetricsRegistry] = None,
+                 blob_dir: Optional[str] = None, spill_threshold: int = DEFAULT_SPILL_THRESHOLD,
+                 retention: Optional[RetentionPolicy] = None, shards: int = 1, search_index=None,
+                 read_cache_size: int = 100):
+        self.logger = logging.getLogger('MemoryManager')
+        self.db_path = db_path
+        self.retention = retention or RetentionPolicy()
+        self.search_index = search_index
+        # Values larger than spill_threshold bytes go to a content-addressed blob directory so the
+        # memory table stays small; file databases spill next to the database file by default.
+        if blob_dir is None and db_path != ':memory:':
+            blob_dir = f"{db_path}.blobs"
+        self.blob_store = BlobStore(blob_dir) if blob_dir else None
+        self.spill_threshold = spill_threshold
+        metrics = metrics_registry or registry
+        self._read_latency = metrics.histogram('taskmaster_memory_read_seconds', 'Latency of MemoryManager reads')
+        self._write_latency = metrics.histogram('taskmaster_memory_write_seconds', 'Latency of MemoryManager writes')
+        self._serialization_time = metrics.histogram(
+            'taskmaster_serialization_seconds', 'Time spent serializing and deserializing memory values')
+        self._spilled_bytes = metrics.counter('taskmaster_memory_spilled_bytes', 'Bytes of values spilled to blobs')
+        self._evicted_rows = metrics.counter('taskmaster_memory_evicted_rows', 'Rows removed by retention sweeps')
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_sweeper = threading.Event()
+        self.read_cache_size = read_cache_size
+        # (namespace, key) -> (expires_at, data), least recently used first
+        self._read_cache: "OrderedDict[Tuple[str, str], Tuple[Optional[float], Any]]" = OrderedDict()
+        self._read_cache_lock = threading.Lock()
+        # Bumped by every write and delete; a read only fills the cache if nothing was written since it began.
+        # Bulk invalidations bump the generation and reset the per-key versions.
+        self._cache_generation = 0
+        self._key_versions: Dict[Tuple[str, str], int] = {}
+        self.shards = [MemoryShard(self._shard_path(i)) for i in range(shards)]
+        self._check_shard_count()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Connection of the first shard, which is the whole keyspace when unsharded."""
+        return self.shards[0].conn
+
+    def _shard_path(self, index: int) -> str:
+        if index == 0 or self.db_path == ':memory:':
+            return self.db_path
+        return f"{self.db_path}.shard{index}"
+
+    def _check_shard_count(self):
+        # Keys hash to a shard by count, so reopening with a different count would hide existing rows
+        recorded = self.shards[0].get_meta('shards')
+        if recorded is None:
+            self.shards[0].set_meta('shards', str(len(self.shards)))
+        elif int(recorded) != len(self.shards):
+            raise ValueError(f"{self.db_path} was created with {recorded} shards, not {len(self.shards)}")
+
+    @staticmethod
+    def _check_namespace(namespace: str):
+        # A misspelt namespace is a programming error, so every public method raises rather than logging
+        if namespace not in NAMESPACES:
+            raise ValueError(f"Unknown memory namespace: {namespace}")
+
+    def _shard(self, namespace: str, key: str) -> MemoryShard:
+        if len(self.shards) == 1:
+            return self.shards[0]
+        # crc32 rather than hash() so the mapping is stable across processes
+        return self.shards[zlib.crc32(f"{namespace}:{key}".encode('utf-8')) % len(self.shards)]
+
+    def store_data(self, key: str, data: Dict[str, Any], ttl: Optional[float] = None,
+                   namespace: str = SHORT_TERM) -> bool:
+        """Store data under key in namespace.
+
+        It expires after ttl seconds, falling back to the retention policy's TTL for the namespace.
+        """
+        self._check_namespace(namespace)
+        try:
+            shard = self._shard(namespace, key)
+            start = time.perf_counter()
+            value = json.dumps(data)
+            self._serialization_time.observe(time.perf_counter() - start, operation='dumps')
+            ttl = ttl if ttl is not None else self.retention.ttl_for(namespace)
+            expires_at = time.time() + ttl if ttl is not None else None
+            with shard.lock:
+                blob = None
+                if self.blob_store is not None:
+                    # spill_threshold is in bytes, so compare the encoded size rather than the character count
+                    encoded = value.encode('utf-8')
+                    if len(encoded) > self.spill_threshold:
+                        blob = self.blob_store.put(encoded)
+                        self._spilled_bytes.inc(len(encoded))
+                        value = None
+                cursor = shard.conn.cursor()
+                cursor.execute(
+                    "INSERT OR REPLACE INTO memory (namespace, key, value, blob, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (namespace, key, value, blob, expires_at)
+                )
+                shard.conn.commit()
+                self._invalidate(namespace, key)
+            self._write_latency.observe(time.perf_counter() - start)
         except Exception as e:
             self.logger.error(f"Error storing data for key {key}: {str(e)}")
             return False
+        if self.search_index is not None:
+            # The value is already stored, so a failure here only leaves it unsearchable until it is rewritten
+            try:
+                self.search_index.add(namespace, key, data)
+            except Exception as e:
+                self.logger.error(f"Error indexing data for key {key}: {str(e)}")
+        return True
 
-    @lru_cache(maxsize=100)
-    def get_data(self, key: str) -> Optional[Dict[str, Any]]:
+    def _select(self, key: str, namespace: str):
+        shard = self._shard(namespace, key)
+        with shard.lock:
+            cursor = shard.conn.cursor()
+            cursor.execute(
+                "SELECT value, blob, expires_at FROM memory "
+                "WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time())
+            )
+            return cursor.fetchone()
+
+    def get_data(self, key: str, namespace: str = SHORT_TERM) -> Optional[Dict[str, Any]]:
+        self._check_namespace(namespace)
+        start = time.perf_counter()
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT value FROM memory WHERE key = ?", (key,))
-            result = cursor.fetchone()
-            if result:
-                return json.loads(result[0])
-            return None
+            cache_key = (namespace, key)
+            with self._read_cache_lock:
+                cached = self._read_cache.get(cache_key)
+                if cached is not None:
+                    if cached[0] is None or cached[0] > time.time():
+                        self._read_cache.move_to_end(cache_key)
+                        self._read_latency.observe(time.perf_counter() - start)
+                        return cached[1]
+                    del self._read_cache[cache_key]
+                version = (self._cache_generation, self._key_versions.get(cache_key, 0))
+            # Only the SELECT holds the shard lock; decoding runs unlocked, and the version check keeps
+            # a value replaced by a concurrent store out of the cache
+            data, expires_at = self._load_data(key, namespace)
+            if data is not None and self.read_cache_size > 0:
+                with self._read_cache_lock:
+                    if version == (self._cache_generation, self._key_versions.get(cache_key, 0)):
+                        self._read_cache[cache_key] = (expires_at, data)
+                        if len(self._read_cache) > self.read_cache_size:
+                            self._read_cache.popitem(last=False)
+            self._read_latency.observe(time.perf_counter() - start)
+            return data
         except Exception as e:
             self.logger.error(f"Error retrieving data for key {key}: {str(e)}")
             return None
 
-    def clear_data(self, key: str) -> bool:
+    def _load_data(self, key: str, namespace: str) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
+        """Read and decode key from its shard, returning the value and when it expires."""
+        result = self._select(key, namespace)
+        if not result:
+            return None, None
+        value = result[0]
+        if result[1] is not None:
+            try:
+                # Decoding to str copies once; mapping the blob saves reading it into a bytes object first
+                with self._open_blob(result[1]) as view:
+                    value = str(view, 'utf-8')
+            except FileNotFoundError:
+                # The row may have been replaced and its blob collected since the unlocked SELECT
+                retry = self._select(key, namespace)
+                if retry == result:
+                    raise
+                return self._load_data(key, namespace)
+        decode_start = time.perf_counter()
+        data = json.loads(value)
+        self._serialization_time.observe(time.perf_counter() - decode_start, operation='loads')
+        return data, result[2]
+
+    def _invalidate(self, namespace: Optional[str] = None, key: Optional[str] = None):
+        """Drop cached reads for one key, one namespace, or everything."""
+        with self._read_cache_lock:
+            if key is not None:
+                self._read_cache.pop((namespace, key), None)
+                self._key_versions[(namespace, key)] = self._key_versions.get((namespace, key), 0) + 1
+                return
+            self._cache_generation += 1
+            self._key_versions.clear()
+            if namespace is None:
+                self._read_cache.clear()
+            else:
+                for cached in [cached for cached in self._read_cache if cached[0] == namespace]:
+                    del self._read_cache[cached]
+
+    @contextmanager
+    def _open_blob(self, digest: str) -> Iterator[memoryview]:
+        with self.blob_store.open(digest) if self.blob_store is not None else nullcontext() as view:
+            if view is None:
+                raise FileNotFoundError(f"Blob {digest} is missing")
+            yield view
+
+    def get_raw(self, key: str, namespace: str = SHORT_TERM) -> Optional[bytes]:
+        """Return the serialized JSON for key without decoding it."""
+        self._check_namespace(namespace)
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM memory WHERE key = ?", (key,))
-            self.conn.commit()
-            self.get_data.cache_clear()
+            result = self._select(key, namespace)
+            if not result:
+                return None
+            if result[1] is not None:
+                raw = self.blob_store.get(result[1]) if self.blob_store is not None else None
+                if raw is None:
+                    raise FileNotFoundError(f"Blob {result[1]} is missing")
+                return raw
+            return result[0].encode('utf-8')
+        except Exception as e:
+            self.logger.error(f"Error retrieving raw data for key {key}: {str(e)}")
+            return None
+
+    def keys(self, namespace: str = SHORT_TERM) -> List[str]:
+        """List the live keys in namespace across all shards."""
+        self._check_namespace(namespace)
+        now = time.time()
+        keys = []
+        for shard in self.shards:
+            with shard.lock:
+                keys.extend(row[0] for row in shard.conn.execute(
+                    "SELECT key FROM memory WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (namespace, now)))
+        return sorted(keys)
+
+    def search(self, query: str, k: int = 5, namespace: str = RESULT, mode: str = 'hybrid') -> List[Dict[str, Any]]:
+        """Return up to k stored values relevant to query, best first.
+
+        Args:
+            query (str): Free text to match against indexed values.
+            k (int, optional): Maximum number of results. Defaults to 5.
+            namespace (str, optional): Namespace to search. Defaults to result.
+            mode (str, optional): ``text`` (FTS5 keyword ranking), ``vector`` (embedding similarity)
+                or ``hybrid`` (both, fused). Defaults to hybrid.
+
+        Returns:
+            list: Dicts with ``key``, ``score`` and ``data``; empty when no search index is attached.
+        """
+        self._check_namespace(namespace)
+        if self.search_index is None:
+            return []
+        try:
+            if mode == 'text':
+                ranked = self.search_index.search_text(query, k, namespace)
+            elif mode == 'vector':
+                ranked = self.search_index.search_similar(query, k, namespace)
+            elif mode == 'hybrid':
+                ranked = self.search_index.search(query, k, namespace)
+            else:
+                raise ValueError(f"Unknown search mode: {mode}")
+            results = []
+            for key, score in ranked:
+                data = self.get_data(key, namespace)
+                if data is None:
+                    # Expired or evicted since it was indexed
+                    self.search_index.remove(namespace, key)
+                    continue
+                results.append({"key": key, "score": score, "data": data})
+            return results
+        except ValueError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error searching memory for {query!r}: {str(e)}")
+            return []
+
+    def collect_blobs(self) -> int:
+        """Delete blobs no longer referenced by any key and return how many were removed."""
+        if self.blob_store is None:
+            return 0
+        try:
+            # Blobs are shared between shards, so every shard is held while the live set is computed
+            with ExitStack() as stack:
+                live = set()
+                for shard in self.shards:
+                    stack.enter_context(shard.lock)
+                    live.update(row[0] for row in shard.conn.execute(
+                        "SELECT DISTINCT blob FROM memory WHERE blob IS NOT NULL"))
+                return self.blob_store.collect_garbage(live)
+        except Exception as e:
+            self.logger.error(f"Error collecting blobs: {str(e)}")
+            return 0
+
+    def clear_data(self, key: str, namespace: str = SHORT_TERM) -> bool:
+        self._check_namespace(namespace)
+        try:
+            shard = self._shard(namespace, key)
+            with shard.lock:
+                cursor = shard.conn.cursor()
+                cursor.execute("DELETE FROM memory WHERE namespace = ? AND key = ?", (namespace, key))
+                shard.conn.commit()
+                self._invalidate(namespace, key)
+            if self.search_index is not None:
+                self.search_index.remove(namespace, key)
             return True
         except Exception as e:
             self.logger.error(f"Error clearing data for key {key}: {str(e)}")
             return False
 
-    def clear_all_data(self) -> bool:
+    def clear_all_data(self, namespace: Optional[str] = None) -> bool:
+        """Delete every key, or only the keys in namespace."""
+        if namespace is not None:
+            self._check_namespace(namespace)
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM memory")
-            self.conn.commit()
-            self.get_data.cache_clear()
+            for shard in self.shards:
+                with shard.lock:
+                    cursor = shard.conn.cursor()
+                    if namespace is None:
+                        cursor.execute("DELETE FROM memory")
+                    else:
+                        cursor.execute("DELETE FROM memory WHERE namespace = ?", (namespace,))
+                    shard.conn.commit()
+            self._invalidate(namespace)
+            if self.search_index is not None:
+                self.search_index.clear(namespace)
             return True
         except Exception as e:
             self.logger.error(f"Error clearing all data: {str(e)}")
             return False
 
+    def sweep(self) -> int:
+        """Delete expired rows and enforce max_rows, in batches; returns the number of rows removed."""
+        try:
+            deleted = 0
+            batch_size = self.retention.batch_size
+            for shard in self.shards:
+                deleted += shard.delete_in_batches(
+                    "expires_at IS NOT NULL AND expires_at <= ?", (time.time(),), batch_size)
+                if self.retention.max_rows is not None:
+                    with shard.lock:
+                        rows = shard.conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0]
+                    excess = rows - self.retention.max_rows // len(self.shards)
+                    if excess > 0:
+                        deleted += shard.delete_in_batches(
+                            "1", (), batch_size, order_by="ORDER BY timestamp, rowid", limit=excess)
+            if deleted:
+                self._evicted_rows.inc(deleted)
+                self._invalidate()
+                self.collect_blobs()
+                if self.search_index is not None:
+                    for namespace in self.search_index.namespaces:
+                        self.search_index.retain(namespace, self.keys(namespace))
+                self.compact()
+            return deleted
+        except Exception as e:
+            self.logger.error(f"Error sweeping memory: {str(e)}")
+            return 0
+
+    def compact(self, full: bool = False) -> bool:
+        """Return free pages to the file system: incrementally by default, or with a full VACUUM.
+
+        A shard whose database predates ``auto_vacuum = INCREMENTAL`` has nothing to free incrementally,
+        so it gets a one-time full VACUUM, which switches it over.
+        """
+        try:
+            for shard in self.shards:
+                with shard.lock:
+                    # 2 is INCREMENTAL
+                    if full or shard.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                        shard.conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                        shard.conn.execute("VACUUM")
+                    else:
+                        shard.conn.execute(f"PRAGMA incremental_vacuum({int(self.retention.vacuum_pages)})").fetchall()
+                    shard.conn.commit()
+            return True
+        except Exception as e:
+            self.logger.error(f"Error compacting memory: {str(e)}")
+            return False
+
+    def start_sweeper(self):
+        """Run sweep() every retention.sweep_interval seconds on a daemon thread."""
+        if self._sweeper is not None:
+            return
+        self._stop_sweeper.clear()
+
+        def run():
+            while not self._stop_sweeper.wait(self.retention.sweep_interval):
+                self.sweep()
+
+        self._sweeper = threading.Thread(target=run, name='memory-sweeper', daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._stop_sweeper.set()
+            self._sweeper.join()
+            self._sweeper = None
+
+    def close(self):
+        self.stop_sweeper()
+        for shard in self.shards:
+            shard.close()
+        if self.search_index is not None:
+            self.search_index.close()
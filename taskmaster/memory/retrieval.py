@@ -0,0 +1,321 @@
+# taskmaster/memory/retrieval.py
+
+import logging
+import re
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from taskmaster.memory.memory_manager import LONG_TERM, RESULT
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def text_of(data: Any) -> str:
+    """Flatten the strings inside a stored JSON value into one searchable text."""
+    if isinstance(data, str):
+        return data
+    if isinstance(data, dict):
+        return " ".join(text_of(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return " ".join(text_of(value) for value in data)
+    return ""
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class HashedVectorizer:
+    """Bag-of-words embeddings using the hashing trick, so no vocabulary or model has to be stored.
+
+    Each token is hashed to one of ``dim`` buckets with a hash-derived sign, counts are
+    log-scaled, and the vector is L2-normalized so a dot product is the cosine similarity.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def encode(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        tokens = tokenize(text)
+        if not tokens:
+            return vector
+        hashes = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in tokens), dtype=np.uint32,
+                             count=len(tokens))
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, (hashes % self.dim).astype(np.intp), signs)
+        vector = np.sign(vector) * np.log1p(np.abs(vector))
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class VectorIndex:
+    """Approximate nearest-neighbour index over unit vectors held in one NumPy matrix.
+
+    Vectors are bucketed by random-hyperplane signatures (locality-sensitive hashing) in
+    ``n_tables`` independent tables. A query probes its own bucket and every bucket one bit
+    away in each table, then ranks the union of those candidates exactly.
+    Small indexes, or queries that find fewer than k candidates, fall back to an exact scan,
+    which is a single matrix-vector product.
+    """
+
+    def __init__(self, dim: int = 256, n_bits: int = 10, n_tables: int = 4, exact_threshold: int = 2048,
+                 seed: int = 0):
+        self.dim = dim
+        self.n_bits = n_bits
+        self.exact_threshold = exact_threshold
+        self._planes = np.random.default_rng(seed).standard_normal((n_tables * n_bits, dim)).astype(np.float32)
+        self._bit_values = 1 << np.arange(n_bits, dtype=np.int64)
+        self._vectors = np.zeros((64, dim), dtype=np.float32)
+        self._live = np.zeros(64, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._signatures: Dict[int, Tuple[int, ...]] = {}
+        self._buckets: List[Dict[int, Set[int]]] = [{} for _ in range(n_tables)]
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    def _signature(self, vector: np.ndarray) -> Tuple[int, ...]:
+        bits = ((self._planes @ vector) > 0).reshape(len(self._buckets), self.n_bits)
+        return tuple(int(value) for value in bits @ self._bit_values)
+
+    def add(self, item_id: str, vector: np.ndarray):
+        self.remove(item_id)
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._ids)
+            self._ids.append(None)
+            if row >= len(self._vectors):
+                # Grow geometrically so appends stay amortized O(1)
+                self._vectors = np.concatenate([self._vectors, np.zeros_like(self._vectors)])
+                self._live = np.concatenate([self._live, np.zeros_like(self._live)])
+        self._vectors[row] = vector
+        self._live[row] = True
+        self._ids[row] = item_id
+        self._rows[item_id] = row
+        signature = self._signature(vector)
+        self._signatures[row] = signature
+        for buckets, bucket_id in zip(self._buckets, signature):
+            buckets.setdefault(bucket_id, set()).add(row)
+
+    def remove(self, item_id: str) -> bool:
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return False
+        for buckets, bucket_id in zip(self._buckets, self._signatures.pop(row)):
+            buckets[bucket_id].discard(row)
+        self._live[row] = False
+        self._ids[row] = None
+        self._free.append(row)
+        return True
+
+    def _candidates(self, vector: np.ndarray) -> np.ndarray:
+        rows: Set[int] = set()
+        for buckets, bucket_id in zip(self._buckets, self._signature(vector)):
+            rows.update(buckets.get(bucket_id, ()))
+            for bit in range(self.n_bits):
+                rows.update(buckets.get(bucket_id ^ (1 << bit), ()))
+        return np.fromiter(rows, dtype=np.intp, count=len(rows))
+
+    def search(self, vector: np.ndarray, k: int = 5) -> List[Tuple[str, float]]:
+        if not self._rows or k <= 0:
+            return []
+        rows = None
+        if len(self._rows) > self.exact_threshold:
+            rows = self._candidates(vector)
+            if len(rows) < k:
+                rows = None
+        if rows is None:
+            rows = np.flatnonzero(self._live[:len(self._ids)])
+        scores = self._vectors[rows] @ vector
+        if len(rows) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self._ids[rows[i]], float(scores[i])) for i in top]
+
+
+class _IndexPartition:
+    """Database, lock and vectors for one indexed namespace."""
+
+    def __init__(self, db_path: str, dim: int):
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.vectors = VectorIndex(dim)
+
+
+class MemoryIndex:
+    """Keyword (SQLite FTS5) and vector-similarity index over MemoryManager values.
+
+    Attach it with ``MemoryManager(search_index=MemoryIndex(...))``; values stored in the
+    indexed namespaces are then searchable with ``MemoryManager.search``. Embeddings are
+    persisted next to the full-text index, so reopening a file-backed index does not
+    re-encode anything. Each namespace is a separate database with its own connection and
+    lock, so writers to different namespaces do not serialize on the index. A file index
+    keeps namespace ``ns`` in ``<db_path>.<ns>``.
+
+    Args:
+        db_path (str, optional): SQLite database for the index. Defaults to an in-memory database.
+        namespaces (sequence, optional): Namespaces to index. Defaults to long_term and result.
+        dim (int, optional): Embedding dimension. Defaults to 256.
+    """
+
+    def __init__(self, db_path: str = ':memory:', namespaces: Sequence[str] = (LONG_TERM, RESULT), dim: int = 256):
+        self.logger = logging.getLogger('MemoryIndex')
+        self.namespaces = tuple(namespaces)
+        self.vectorizer = HashedVectorizer(dim)
+        self.db_path = db_path
+        self.partitions = {namespace: _IndexPartition(self._partition_path(namespace), dim)
+                           for namespace in self.namespaces}
+        for namespace, partition in self.partitions.items():
+            self._create_tables(partition)
+            self._load_vectors(namespace, partition)
+
+    def _partition_path(self, namespace: str) -> str:
+        if self.db_path == ':memory:':
+            return self.db_path
+        return f"{self.db_path}.{namespace}"
+
+    @property
+    def vectors(self) -> Dict[str, VectorIndex]:
+        return {namespace: partition.vectors for namespace, partition in self.partitions.items()}
+
+    def _create_tables(self, partition: _IndexPartition):
+        with partition.lock:
+            # memory_fts rows share their rowid with memory_vectors.id, so updates and deletes are
+            # rowid lookups instead of scans over the unindexed namespace and key columns
+            partition.conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS memory_fts USING fts5(namespace UNINDEXED, key UNINDEXED, content)")
+            partition.conn.execute('''
+                CREATE TABLE IF NOT EXISTS memory_vectors (
+                    id INTEGER PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    UNIQUE (namespace, key)
+                )
+            ''')
+            partition.conn.commit()
+
+    def _load_vectors(self, namespace: str, partition: _IndexPartition):
+        with partition.lock:
+            rows = partition.conn.execute("SELECT key, vector FROM memory_vectors WHERE namespace = ?",
+                                          (namespace,)).fetchall()
+        for key, blob in rows:
+            vector = np.frombuffer(blob, dtype=np.float32)
+            if len(vector) == self.vectorizer.dim:
+                partition.vectors.add(key, vector)
+
+    def add(self, namespace: str, key: str, data: Any) -> bool:
+        """Index data under (namespace, key); values in other namespaces are ignored."""
+        partition = self.partitions.get(namespace)
+        if partition is None:
+            return False
+        text = text_of(data)
+        vector = self.vectorizer.encode(text)
+        with partition.lock:
+            conn = partition.conn
+            row = conn.execute("SELECT id FROM memory_vectors WHERE namespace = ? AND key = ?",
+                               (namespace, key)).fetchone()
+            if row is None:
+                row_id = conn.execute("INSERT INTO memory_vectors (namespace, key, vector) VALUES (?, ?, ?)",
+                                      (namespace, key, vector.tobytes())).lastrowid
+            else:
+                row_id = row[0]
+                conn.execute("UPDATE memory_vectors SET vector = ? WHERE id = ?", (vector.tobytes(), row_id))
+                conn.execute("DELETE FROM memory_fts WHERE rowid = ?", (row_id,))
+            conn.execute("INSERT INTO memory_fts (rowid, namespace, key, content) VALUES (?, ?, ?, ?)",
+                         (row_id, namespace, key, text))
+            conn.commit()
+            partition.vectors.add(key, vector)
+        return True
+
+    def remove(self, namespace: str, key: str):
+        partition = self.partitions.get(namespace)
+        if partition is None:
+            return
+        with partition.lock:
+            row = partition.conn.execute("SELECT id FROM memory_vectors WHERE namespace = ? AND key = ?",
+                                         (namespace, key)).fetchone()
+            if row is not None:
+                partition.conn.execute("DELETE FROM memory_fts WHERE rowid = ?", (row[0],))
+                partition.conn.execute("DELETE FROM memory_vectors WHERE id = ?", (row[0],))
+                partition.conn.commit()
+            partition.vectors.remove(key)
+
+    def clear(self, namespace: Optional[str] = None):
+        for name in self.namespaces if namespace is None else [namespace]:
+            partition = self.partitions.get(name)
+            if partition is None:
+                continue
+            with partition.lock:
+                partition.conn.execute(
+                    "DELETE FROM memory_fts WHERE rowid IN (SELECT id FROM memory_vectors WHERE namespace = ?)",
+                    (name,))
+                partition.conn.execute("DELETE FROM memory_vectors WHERE namespace = ?", (name,))
+                partition.conn.commit()
+                partition.vectors = VectorIndex(self.vectorizer.dim)
+
+    def retain(self, namespace: str, live_keys: Iterable[str]) -> int:
+        """Drop index entries whose key is no longer in live_keys and return how many were removed."""
+        partition = self.partitions.get(namespace)
+        if partition is None:
+            return 0
+        live = set(live_keys)
+        with partition.lock:
+            stale = [key for key, in partition.conn.execute(
+                "SELECT key FROM memory_vectors WHERE namespace = ?", (namespace,)) if key not in live]
+        for key in stale:
+            self.remove(namespace, key)
+        return len(stale)
+
+    def search_text(self, query: str, k: int = 5, namespace: str = RESULT) -> List[Tuple[str, float]]:
+        """Rank keys by BM25 over the indexed text; higher scores are better."""
+        tokens = tokenize(query)
+        partition = self.partitions.get(namespace)
+        if not tokens or partition is None:
+            return []
+        # Quote every token so user text can never be parsed as FTS5 query syntax
+        match = " OR ".join(f'"{token}"' for token in dict.fromkeys(tokens))
+        with partition.lock:
+            rows = partition.conn.execute(
+                # rank is bm25() by default, and ordering by it lets FTS5 sort inside the virtual table
+                "SELECT key, rank FROM memory_fts WHERE memory_fts MATCH ? AND namespace = ? ORDER BY rank LIMIT ?",
+                (match, namespace, k)
+            ).fetchall()
+        return [(key, -score) for key, score in rows]
+
+    def search_similar(self, query: str, k: int = 5, namespace: str = RESULT) -> List[Tuple[str, float]]:
+        """Rank keys by cosine similarity of their hashed bag-of-words embeddings."""
+        partition = self.partitions.get(namespace)
+        if partition is None:
+            return []
+        vector = self.vectorizer.encode(query)
+        if not vector.any():
+            return []
+        with partition.lock:
+            return [(key, score) for key, score in partition.vectors.search(vector, k) if score > 0]
+
+    def search(self, query: str, k: int = 5, namespace: str = RESULT) -> List[Tuple[str, float]]:
+        """Combine keyword and vector rankings with reciprocal rank fusion."""
+        fused: Dict[str, float] = {}
+        for ranking in (self.search_text(query, k, namespace), self.search_similar(query, k, namespace)):
+            for rank, (key, _) in enumerate(ranking):
+                fused[key] = fused.get(key, 0.0) + 1.0 / (60 + rank)
+        return sorted(fused.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def close(self):
+        for partition in self.partitions.values():
+            with partition.lock:
+                partition.conn.close()
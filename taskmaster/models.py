@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 class Task:
     def __init__(self, task_id: str, task_type: str, input_data: Dict[str, Any], parameters: Dict[str, Any]):
@@ -7,6 +7,7 @@ class Task:
         self.input_data = input_data
         self.parameters = parameters
         self.status = "Created"  # Added this line
+        self.enqueued_at: Optional[float] = None  # Set by the orchestrator when the task becomes ready
 
     def to_dict(self):
         return {
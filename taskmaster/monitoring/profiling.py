@@ -0,0 +1,117 @@
+# taskmaster/monitoring/profiling.py
+
+import cProfile
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def _top_functions(stats: pstats.Stats, top_n: int) -> List[Dict[str, Any]]:
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            "function": f"{filename}:{line}({name})",
+            "ncalls": ncalls,
+            "tottime": tottime,
+            "cumtime": cumtime
+        })
+    rows.sort(key=lambda row: row["cumtime"], reverse=True)
+    return rows[:top_n]
+
+
+class WorkflowProfiler:
+    """Deterministic CPU (cProfile) and allocation (tracemalloc) profiler for workflow runs.
+
+    Each task is profiled separately so the report attributes time and memory per task;
+    the per-task CPU profiles are also merged into a per-function view of the whole run.
+    """
+
+    def __init__(self, top_n: int = 25, trace_allocations: bool = True):
+        self.logger = logging.getLogger('WorkflowProfiler')
+        self.top_n = top_n
+        self.trace_allocations = trace_allocations
+        self.task_reports: List[Dict[str, Any]] = []
+        self.stats: Optional[pstats.Stats] = None
+        self.wall_time = 0.0
+        self._started_tracemalloc = False
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._start = 0.0
+
+    def __enter__(self):
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.trace_allocations:
+            self._snapshot = tracemalloc.take_snapshot()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall_time = time.perf_counter() - self._start
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._snapshot = None
+        return False
+
+    @contextmanager
+    def profile_task(self, task) -> Iterator[None]:
+        profile = cProfile.Profile()
+        if self.trace_allocations:
+            tracemalloc.reset_peak()
+            memory_before, _ = tracemalloc.get_traced_memory()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            report = {
+                "task_id": task.task_id,
+                "task_type": task.task_type,
+                "wall_time": time.perf_counter() - wall_start,
+                "cpu_time": time.process_time() - cpu_start
+            }
+            stats = pstats.Stats(profile)
+            report["top_functions"] = _top_functions(stats, self.top_n)
+            if self.stats is None:
+                self.stats = stats
+            else:
+                self.stats.add(stats)
+            if self.trace_allocations:
+                memory_after, peak = tracemalloc.get_traced_memory()
+                snapshot = tracemalloc.take_snapshot()
+                report["allocated_bytes"] = memory_after - memory_before
+                report["peak_bytes"] = peak - memory_before
+                report["top_allocations"] = [
+                    {"location": str(diff.traceback), "size_diff": diff.size_diff, "count_diff": diff.count_diff}
+                    for diff in snapshot.compare_to(self._snapshot, 'lineno')[:self.top_n]
+                ]
+                self._snapshot = snapshot
+            self.task_reports.append(report)
+
+    def report(self, workflow_id: str) -> Dict[str, Any]:
+        return {
+            "workflow_id": workflow_id,
+            "wall_time": self.wall_time,
+            "cpu_time": sum(task["cpu_time"] for task in self.task_reports),
+            "tasks": self.task_reports,
+            "functions": _top_functions(self.stats, self.top_n) if self.stats else []
+        }
+
+    def write_report(self, path: str, workflow_id: str) -> bool:
+        """Write the JSON report to ``path`` and the merged cProfile data to ``path + '.pstats'``."""
+        try:
+            with open(path, 'w') as f:
+                json.dump(self.report(workflow_id), f, indent=2)
+            if self.stats is not None:
+                self.stats.dump_stats(f"{path}.pstats")
+            return True
+        except (OSError, TypeError) as e:
+            self.logger.error(f"Error writing profile report to {path}: {str(e)}")
+            return False
@@ -0,0 +1,133 @@
+# taskmaster/monitoring/tracing.py
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.duration: Optional[float] = None
+        self._start = time.perf_counter()
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration": self.duration,
+            "attributes": self.attributes
+        }
+
+
+class _NullSpan:
+    """Stand-in yielded when tracing is disabled so callers never need to check."""
+
+    def __init__(self):
+        self.attributes: Dict[str, Any] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {}
+
+
+class Tracer:
+    """Records nested timing spans, one trace per workflow run.
+
+    Tracing is off by default; when disabled ``span`` costs a single attribute check.
+    Finished spans are kept in a bounded buffer and can be exported as JSON lines.
+    """
+
+    def __init__(self, enabled: bool = False, max_spans: int = 10000):
+        self.logger = logging.getLogger('Tracer')
+        self.enabled = enabled
+        self._finished: deque = deque(maxlen=max_spans)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        if not self.enabled:
+            # A fresh instance per span so attributes set by one caller never leak into another
+            yield _NullSpan()
+            return
+        span = self.start_span(name, **attributes)
+        try:
+            with self.activate(span):
+                yield span
+        finally:
+            self.finish_span(span)
+
+    def start_span(self, name: str, **attributes: Any) -> Any:
+        """Start a span under the current one without entering it; pair with ``activate`` and ``finish_span``.
+
+        Generators use this so the span is only current while they run, never while suspended at a yield.
+        """
+        if not self.enabled:
+            return _NullSpan()
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        return Span(name, trace_id, parent.span_id if parent else None, attributes)
+
+    @contextmanager
+    def activate(self, span: Any) -> Iterator[Any]:
+        """Make span the parent of spans started on this thread inside the block, without finishing it."""
+        if not isinstance(span, Span):
+            yield span
+            return
+        stack = self._stack()
+        stack.append(span)
+        try:
+            yield span
+        finally:
+            stack.pop()
+
+    def finish_span(self, span: Any):
+        if not isinstance(span, Span):
+            return
+        span.finish()
+        with self._lock:
+            self._finished.append(span)
+
+    def finished_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._finished)
+
+    def clear(self):
+        with self._lock:
+            self._finished.clear()
+
+    def export_json(self, path: str) -> bool:
+        try:
+            with open(path, 'a') as f:
+                for span in self.finished_spans():
+                    f.write(json.dumps(span.to_dict()) + '\n')
+            return True
+        except (OSError, TypeError) as e:
+            self.logger.error(f"Error exporting spans to {path}: {str(e)}")
+            return False
+
+
+tracer = Tracer()
@@ -1,9 +1,15 @@
 # taskmaster_ai/src/orchestrator/orchestrator.py
 
+import asyncio
+import itertools
 import logging
-from typing import Dict, Any, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, Any, Iterator, List, Optional, Tuple
 from taskmaster.models import Task, TaskResult
-from taskmaster.memory.memory_manager import MemoryManager
+from taskmaster.memory.memory_manager import WORKFLOW, MemoryManager
+from taskmaster.monitoring.profiling import WorkflowProfiler
 import networkx as nx
 
 class Workflow:
@@ -31,6 +37,7 @@ class Task:
         self.input_data = input_data
         self.parameters = parameters
         self.status = "Created"
+        self.enqueued_at: Optional[float] = None
 
     def to_dict(self):
         return {
@@ -48,46 +55,180 @@ class Task:
         return task
 
 class Orchestrator:
-    def __init__(self, core_engine):
+    def __init__(self, core_engine, db_path: str = 'orchestrator.db'):
         self.logger = logging.getLogger('Orchestrator')
         self.core_engine = core_engine
-        self.memory_manager = MemoryManager(db_path='orchestrator.db')
+        self.memory_manager = MemoryManager(db_path=db_path, metrics_registry=core_engine.metrics)
         self.workflows = self._load_workflows()
+        self._subscribers: Dict[int, Tuple[Optional[str], Callable[[Dict[str, Any]], None]]] = {}
+        self._subscriber_ids = itertools.count(1)
+        self._subscribers_lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], None], workflow_id: Optional[str] = None) -> int:
+        """Call callback with every status-change event, or only those of workflow_id.
+
+        Events are dicts with ``event`` (``workflow_started``, ``task_status`` or ``workflow_finished``),
+        ``workflow_id``, ``timestamp`` and, for task events, ``task_id``, ``status`` and ``previous_status``.
+        Callbacks run synchronously on the executing thread, so they should hand off slow work.
+
+        Returns:
+            int: Subscription id for unsubscribe.
+        """
+        subscription_id = next(self._subscriber_ids)
+        with self._subscribers_lock:
+            self._subscribers[subscription_id] = (workflow_id, callback)
+        return subscription_id
+
+    def unsubscribe(self, subscription_id: int) -> bool:
+        with self._subscribers_lock:
+            return self._subscribers.pop(subscription_id, None) is not None
+
+    def _publish(self, event: str, workflow_id: str, **fields):
+        if not self._subscribers:
+            return
+        payload = {"event": event, "workflow_id": workflow_id, "timestamp": time.time(), **fields}
+        with self._subscribers_lock:
+            callbacks = [callback for wanted, callback in self._subscribers.values()
+                         if wanted is None or wanted == workflow_id]
+        for callback in callbacks:
+            try:
+                callback(payload)
+            except Exception as e:
+                self.logger.error(f"Error in status subscriber for workflow {workflow_id}: {str(e)}")
+
+    def _set_status(self, workflow_id: str, task, status: str):
+        previous_status, task.status = task.status, status
+        self._publish("task_status", workflow_id, task_id=task.task_id, status=status,
+                      previous_status=previous_status)
 
     def _load_workflows(self):
-        workflows_data = self.memory_manager.get_data('workflows')
+        workflows_data = self.memory_manager.get_data('workflows', namespace=WORKFLOW)
+        if workflows_data is None:
+            # Databases written before namespaces existed keep the workflows in the default namespace;
+            # move them over once so later loads never consult the legacy row
+            workflows_data = self.memory_manager.get_data('workflows')
+            if workflows_data is not None and self.memory_manager.store_data(
+                    'workflows', workflows_data, namespace=WORKFLOW):
+                self.memory_manager.clear_data('workflows')
         if not workflows_data:
             return {}
         return {workflow_id: Workflow.from_dict(data) for workflow_id, data in workflows_data.items()}
 
     def _save_workflows(self):
         workflows_data = {workflow_id: workflow.to_dict() for workflow_id, workflow in self.workflows.items()}
-        self.memory_manager.store_data('workflows', workflows_data)
+        self.memory_manager.store_data('workflows', workflows_data, namespace=WORKFLOW)
 
     def create_workflow(self, workflow_id: str, tasks: List[Task], dependencies: Dict[str, List[str]]) -> bool:
         try:
             workflow = Workflow(workflow_id, tasks, dependencies)
             self.workflows[workflow_id] = workflow
             self._save_workflows()
-            self.logger.debug(f"Workflow {workflow_id} created successfully with tasks: {tasks} and dependencies: {dependencies}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Workflow %s created successfully with tasks: %s and dependencies: %s",
+                                  workflow_id, [task.task_id for task in tasks], dependencies)
             return True
         except Exception as e:
             self.logger.error(f"Error creating workflow {workflow_id}: {str(e)}")
             return False
 
-    def execute_workflow(self, workflow_id: str) -> Dict[str, TaskResult]:
+    def execute_workflow(self, workflow_id: str, profiler: Optional[WorkflowProfiler] = None) -> Dict[str, TaskResult]:
+        return dict(self.stream_workflow(workflow_id, profiler=profiler))
+
+    def stream_workflow(self, workflow_id: str,
+                        profiler: Optional[WorkflowProfiler] = None) -> Iterator[Tuple[str, TaskResult]]:
+        """Execute a workflow, yielding (task_id, TaskResult) as each task completes.
+
+        Consumers can start on the first results while later tasks are still pending; the
+        workflow is persisted once the generator is exhausted or closed. Tasks that depend on a
+        failed task are not run: they are marked Skipped and yield a result with an error.
+        """
         if workflow_id not in self.workflows:
             raise ValueError(f"Workflow {workflow_id} not found")
         
         workflow = self.workflows[workflow_id]
-        results = {}
-        
+        tasks_by_id = {task.task_id: task for task in workflow.tasks}
+        graph = self._create_dependency_graph(workflow)
+        try:
+            order = list(nx.topological_sort(graph))
+        except nx.NetworkXUnfeasible:
+            raise ValueError(f"Workflow {workflow_id} has cyclic dependencies")
+        finished_at = {}
+        # Failed and skipped tasks; their dependents are skipped rather than run on missing input
+        failed = set()
+        completed = 0
+        # A rerun starts from scratch, so status events never report a transition out of the previous run's state
         for task in workflow.tasks:
-            results[task.task_id] = TaskResult(task.task_id, "Completed", {"dummy": "result"})
-            task.status = "Completed"
-        
-        self._save_workflows()
-        return results
+            task.status = "Created"
+
+        self._publish("workflow_started", workflow_id, total_tasks=len(workflow.tasks))
+        tracer = self.core_engine.tracer
+        # The span is current only while a task runs: code the consumer runs between results must not nest under it
+        workflow_span = tracer.start_span("execute_workflow", workflow_id=workflow_id)
+        try:
+            started_at = time.time()
+            for task_id in order:
+                task = tasks_by_id.get(task_id)
+                if task is None:
+                    continue
+                blocked_by = next((dep for dep in graph.predecessors(task_id) if dep in failed), None)
+                if blocked_by is not None:
+                    failed.add(task_id)
+                    self._set_status(workflow_id, task, "Skipped")
+                    completed += 1
+                    yield task_id, TaskResult(task_id, None, {
+                        "task_type": task.task_type, "error": f"Skipped because dependency {blocked_by} failed"})
+                    continue
+                with tracer.activate(workflow_span):
+                    # A task becomes ready once its last dependency has finished
+                    task.enqueued_at = max([started_at] + [finished_at[dep] for dep in graph.predecessors(task_id)
+                                                           if dep in finished_at])
+                    self._set_status(workflow_id, task, "Running")
+                    if profiler is not None:
+                        with profiler.profile_task(task):
+                            result = self.core_engine.process_task(task)
+                    else:
+                        result = self.core_engine.process_task(task)
+                    finished_at[task_id] = time.time()
+                    if "error" in result.metadata:
+                        failed.add(task_id)
+                        self._set_status(workflow_id, task, "Failed")
+                    else:
+                        self._set_status(workflow_id, task, "Completed")
+                completed += 1
+                yield task_id, result
+        finally:
+            tracer.finish_span(workflow_span)
+            self._save_workflows()
+            self._publish("workflow_finished", workflow_id, completed_tasks=completed,
+                          total_tasks=len(workflow.tasks))
+
+    async def astream_workflow(self, workflow_id: str) -> AsyncIterator[Tuple[str, TaskResult]]:
+        """Async version of stream_workflow; tasks run off the event loop."""
+        loop = asyncio.get_running_loop()
+        results = self.stream_workflow(workflow_id)
+        done = object()
+        # One dedicated thread advances the generator, so each task's spans are recorded on one thread
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"workflow-{workflow_id}") as executor:
+            try:
+                while True:
+                    item = await loop.run_in_executor(executor, next, results, done)
+                    if item is done:
+                        return
+                    yield item
+            finally:
+                await loop.run_in_executor(executor, results.close)
+
+    def profile_workflow(self, workflow_id: str, report_path: str, top_n: int = 25,
+                         trace_allocations: bool = True) -> Tuple[Dict[str, TaskResult], bool]:
+        """Execute a workflow under cProfile/tracemalloc and write a per-task profile report to report_path.
+
+        Returns:
+            tuple: The task results, and whether the report was written.
+        """
+        profiler = WorkflowProfiler(top_n=top_n, trace_allocations=trace_allocations)
+        with profiler:
+            results = self.execute_workflow(workflow_id, profiler=profiler)
+        return results, profiler.write_report(report_path, workflow_id)
 
     def get_workflow_status(self, workflow_id: str) -> Dict[str, Any]:
         if workflow_id not in self.workflows:
@@ -96,12 +237,16 @@ class Orchestrator:
         workflow = self.workflows[workflow_id]
         total_tasks = len(workflow.tasks)
         completed_tasks = sum(1 for task in workflow.tasks if task.status == "Completed")
-        pending_tasks = total_tasks - completed_tasks
+        failed_tasks = sum(1 for task in workflow.tasks if task.status == "Failed")
+        skipped_tasks = sum(1 for task in workflow.tasks if task.status == "Skipped")
+        pending_tasks = total_tasks - completed_tasks - failed_tasks - skipped_tasks
         
         return {
             "workflow_id": workflow_id,
             "total_tasks": total_tasks,
             "completed_tasks": completed_tasks,
+            "failed_tasks": failed_tasks,
+            "skipped_tasks": skipped_tasks,
             "pending_tasks": pending_tasks,
             "is_complete": pending_tasks == 0
         }
@@ -0,0 +1,147 @@
+# taskmaster_ai/tests/test_ai_model_interface.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from taskmaster.interfaces.ai_model_interface import (HTTPModelBackend, ModelClient, ModelError, ResponseCache,
+                                                      TokenBucket)
+from taskmaster.monitoring.metrics import MetricsRegistry
+
+class StubModelHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append((self.path, payload))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+        if self.path == "/generate":
+            status, body = 200, {"text": f"echo: {payload['prompt']}"}
+        elif self.path == "/classify":
+            status, body = 200, {"scores": {"positive": 0.9, "negative": 0.1}}
+        else:
+            status, body = 404, {"error": "not found"}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubModelHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.active = 0
+    server.max_active = 0
+    server.delay = 0.0
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def backend(stub_server):
+    backend = HTTPModelBackend(f"http://127.0.0.1:{stub_server.server_address[1]}", pool_size=2)
+    yield backend
+    backend.close()
+
+def test_http_backend_round_trip(backend, stub_server):
+    assert backend.generate_text("hello") == "echo: hello"
+    assert backend.classify_text("great") == {"positive": 0.9, "negative": 0.1}
+    assert [path for path, _ in stub_server.requests] == ["/generate", "/classify"]
+
+def test_http_backend_raises_on_error_status(backend):
+    with pytest.raises(ModelError):
+        backend._post("/missing", {})
+
+def test_cache_serves_repeated_prompts(backend, stub_server):
+    client = ModelClient(backend, cache=ResponseCache(), metrics_registry=MetricsRegistry())
+    assert client.generate_text("summarize this") == "echo: summarize this"
+    assert client.generate_text("summarize this") == "echo: summarize this"
+    assert client.classify_text("summarize this") == {"positive": 0.9, "negative": 0.1}
+
+    assert len(stub_server.requests) == 2
+    report = client.report()
+    assert report["hits"] == 1 and report["misses"] == 2
+    assert report["hit_rate"] == pytest.approx(1 / 3)
+    client.close()
+
+def test_cache_persists_and_evicts_least_recently_used(tmp_path):
+    db_path = str(tmp_path / "responses.db")
+    cache = ResponseCache(db_path, max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"
+    cache.put("c", "C")
+    cache.close()
+
+    reopened = ResponseCache(db_path, max_entries=2)
+    assert reopened.get("b") is None
+    assert reopened.get("a") == "A" and reopened.get("c") == "C"
+
+def test_cache_ttl():
+    cache = ResponseCache(ttl=-1)
+    cache.put("a", "A")
+    assert cache.get("a") is None
+
+def test_identical_in_flight_prompts_are_coalesced(backend, stub_server):
+    stub_server.delay = 0.2
+    client = ModelClient(backend, max_workers=4, metrics_registry=MetricsRegistry())
+    futures = [client.submit("generate_text", "same prompt") for _ in range(5)]
+
+    assert {future.result(5) for future in futures} == {"echo: same prompt"}
+    assert len(stub_server.requests) == 1
+    assert client.report() == {"backend_calls": 1, "coalesced": 4}
+    client.close()
+
+def test_pool_bounds_concurrent_connections(backend, stub_server):
+    stub_server.delay = 0.05
+    client = ModelClient(backend, max_workers=8, metrics_registry=MetricsRegistry())
+    futures = [client.submit("generate_text", f"prompt {i}") for i in range(8)]
+
+    assert [future.result(5) for future in futures] == [f"echo: prompt {i}" for i in range(8)]
+    assert stub_server.max_active <= backend.pool_size
+    client.close()
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(15):
+        assert bucket.acquire()
+    # The first 5 are the burst; the other 10 arrive at 50 per second
+    assert time.monotonic() - start >= 0.18
+    assert not bucket.acquire(tokens=5, timeout=0.01)
+
+def test_token_bucket_rejects_requests_it_can_never_fill():
+    bucket = TokenBucket(rate=0.5, capacity=0.5)
+    with pytest.raises(ValueError):
+        bucket.acquire()
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+def test_client_applies_rate_limit(backend, stub_server):
+    client = ModelClient(backend, rate_limiter=TokenBucket(rate=20, capacity=1), metrics_registry=MetricsRegistry())
+    start = time.monotonic()
+    for future in [client.submit("generate_text", f"prompt {i}") for i in range(5)]:
+        future.result(5)
+    assert time.monotonic() - start >= 0.18
+    client.close()
+
+def test_unknown_operation(backend):
+    client = ModelClient(backend, metrics_registry=MetricsRegistry())
+    with pytest.raises(ValueError):
+        client.submit("translate", "hola")
+    client.close()
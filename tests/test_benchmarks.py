@@ -0,0 +1,39 @@
+# taskmaster_ai/tests/test_benchmarks.py
+
+import pytest
+import networkx as nx
+from taskmaster.bench.benchmarks import (bench_engine, bench_memory, bench_orchestrator, compare_reports, make_dag,
+                                         run_benchmarks)
+
+@pytest.mark.parametrize("shape", ["chain", "fan_out", "layered"])
+def test_make_dag_is_acyclic(shape):
+    tasks, dependencies = make_dag(shape, 50)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(task.task_id for task in tasks)
+    graph.add_edges_from((dep, task_id) for task_id, deps in dependencies.items() for dep in deps)
+
+    assert len(tasks) == 50
+    assert nx.is_directed_acyclic_graph(graph)
+
+def test_make_dag_unknown_shape():
+    with pytest.raises(ValueError):
+        make_dag("cycle", 10)
+
+def test_bench_suites_report_throughput():
+    results = bench_memory(ops=20, repeat=1) + bench_engine(tasks_per_type=5, repeat=1) + bench_orchestrator([10])
+
+    assert {r["suite"] for r in results} == {"memory", "engine", "orchestrator"}
+    assert all(r["ops_per_sec"] > 0 for r in results)
+
+def test_compare_reports_flags_regressions():
+    baseline = run_benchmarks(["orchestrator"], dag_sizes=[10])
+    current = {"results": [dict(r, ops_per_sec=r["ops_per_sec"] / 2) for r in baseline["results"]]}
+
+    comparison = compare_reports(baseline, current, threshold=0.1)
+    assert len(comparison) == len(baseline["results"])
+    assert all(entry["regression"] for entry in comparison)
+
+def test_quick_run_caps_dag_sizes():
+    report = run_benchmarks(["orchestrator"], dag_sizes=[10, 100000], quick=True)
+
+    assert {r["params"]["size"] for r in report["results"]} == {10, 1000}
@@ -24,4 +24,18 @@ def test_core_engine_unknown_agent():
     assert result.task_id == "2"
     assert result.result is None
     assert "error" in result.metadata
-    assert "Unsupported agent type" in result.metadata["error"]
\ No newline at end of file
+    assert "Unsupported agent type" in result.metadata["error"]
+def test_core_engine_passes_previous_result_as_context():
+    engine = CoreEngine()
+
+    first = engine.process_task(Task("3", "summarization", {"text": "This is a test."}, {}))
+    agent = engine.agent_registry["summarization"]
+    seen = []
+    process_task = agent.process_task
+    agent.process_task = lambda task: seen.append(task.parameters["context"]) or process_task(task)
+    rerun = Task("3", "summarization", {"text": "This is a test."}, {})
+    engine.process_task(rerun)
+
+    assert seen == [first.result]
+    # The previous result is only passed to the agent, never persisted with the task
+    assert "context" not in rerun.parameters
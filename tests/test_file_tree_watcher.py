@@ -0,0 +1,299 @@
+# taskmaster_ai/tests/test_file_tree_watcher.py
+
+import importlib.util
+import os
+import shutil
+import time
+import pytest
+from watchdog.events import (DirCreatedEvent, DirDeletedEvent, DirMovedEvent, FileCreatedEvent, FileDeletedEvent,
+                             FileModifiedEvent, FileMovedEvent)
+
+_spec = importlib.util.spec_from_file_location(
+    "dynamic_file_tree_watcher",
+    os.path.join(os.path.dirname(__file__), "..", "scripts", "dynamic_file_tree_watcher.py"))
+watcher = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(watcher)
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    for path in ["a/foo/x.py", "a/foobar/y.py", "a/z.txt", "b/c/d.txt", "top.txt"]:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_text("content")
+    return str(root)
+
+def fresh_render(directory):
+    return watcher.print_directory_tree(directory)
+
+def test_render_matches_full_scan(repo):
+    tree = watcher.DirectoryTree(repo)
+    assert tree.render() == fresh_render(repo)
+
+def test_events_patch_tree_incrementally(repo):
+    tree = watcher.DirectoryTree(repo)
+    tree.render()
+
+    os.makedirs(os.path.join(repo, "a", "new", "deep"))
+    open(os.path.join(repo, "a", "new", "deep", "file.py"), "w").close()
+    os.remove(os.path.join(repo, "a", "z.txt"))
+    os.rename(os.path.join(repo, "b", "c"), os.path.join(repo, "e"))
+    events = [
+        DirCreatedEvent(os.path.join(repo, "a", "new")),
+        FileDeletedEvent(os.path.join(repo, "a", "z.txt")),
+        DirMovedEvent(os.path.join(repo, "b", "c"), os.path.join(repo, "e")),
+        FileModifiedEvent(os.path.join(repo, "top.txt"))
+    ]
+    changed = set()
+    for event in events:
+        changed |= tree.apply_event(event)
+    for path in changed:
+        tree.invalidate(path)
+
+    assert changed == {os.path.join(repo, "a"), os.path.join(repo, "b"), repo}
+    assert tree.render() == fresh_render(repo)
+
+def test_events_outside_tree_or_hidden_are_ignored(repo, tmp_path):
+    tree = watcher.DirectoryTree(repo)
+    os.makedirs(os.path.join(repo, ".git"))
+    open(os.path.join(repo, ".git", "HEAD"), "w").close()
+
+    assert tree.apply_event(FileCreatedEvent(os.path.join(repo, ".git", "HEAD"))) == set()
+    assert tree.apply_event(DirCreatedEvent(os.path.join(repo, ".git"))) == set()
+    assert tree.apply_event(FileCreatedEvent(str(tmp_path / "elsewhere.txt"))) == set()
+
+def test_handler_rewrites_output_on_change(repo, tmp_path):
+    output = str(tmp_path / "tree.txt")
+    handler = watcher.FileTreeHandler(repo, output, False, False, None, 0, str(tmp_path / "snapshot.jsonl"))
+    shutil.rmtree(os.path.join(repo, "b"))
+
+    handler.on_any_event(DirDeletedEvent(os.path.join(repo, "b")))
+    handler.flush()
+
+    with open(output) as f:
+        assert f.read().splitlines() == fresh_render(repo)
+
+def test_snapshot_round_trip(repo, tmp_path):
+    cache_file = str(tmp_path / "snapshot.jsonl")
+    output = str(tmp_path / "tree.txt")
+    watcher.FileTreeHandler(repo, output, False, False, None, 0, cache_file)
+
+    handler = watcher.FileTreeHandler(repo, output, False, False, None, 0, cache_file)
+    assert handler.tree.render() == fresh_render(repo)
+    assert handler.tree.dirty_dirs == set()
+
+def test_snapshot_restore_rescans_only_changed_directories(repo, tmp_path):
+    cache_file = str(tmp_path / "snapshot.jsonl")
+    output = str(tmp_path / "tree.txt")
+    watcher.FileTreeHandler(repo, output, False, False, None, 0, cache_file).tree.close()
+
+    # Changes made while the watcher is not running
+    open(os.path.join(repo, "a", "foo", "added.py"), "w").close()
+    shutil.rmtree(os.path.join(repo, "b", "c"))
+
+    records = watcher.TreeSnapshot(cache_file).load(watcher.TreeSnapshot.header(repo, False, False, True))
+    tree = watcher.DirectoryTree(repo, snapshot_records=records)
+
+    assert tree.render() == fresh_render(repo)
+    assert tree.dirty_dirs == {os.path.join(repo, "a", "foo"), os.path.join(repo, "b")}
+
+def test_snapshot_is_rejected_when_ignore_options_change(repo, tmp_path):
+    cache_file = str(tmp_path / "snapshot.jsonl")
+    output = str(tmp_path / "tree.txt")
+    spec = watcher.pathspec.PathSpec.from_lines('gitwildmatch', ["*.py"])
+    watcher.FileTreeHandler(repo, output, False, False, spec, 0, cache_file).tree.close()
+
+    assert watcher.TreeSnapshot(cache_file).load(watcher.TreeSnapshot.header(repo, False, False, True, spec))
+    assert watcher.TreeSnapshot(cache_file).load(watcher.TreeSnapshot.header(repo, False, False, True)) is None
+    handler = watcher.FileTreeHandler(repo, output, False, False, None, 0, cache_file, nested_gitignore=False)
+    handler.tree.close()
+    assert handler.tree.render() == watcher.print_directory_tree(repo, nested_gitignore=False)
+    assert watcher.TreeSnapshot(cache_file).load(watcher.TreeSnapshot.header(repo, False, False, False))
+
+def test_snapshot_appends_changed_directories_and_compacts(repo, tmp_path):
+    cache_file = str(tmp_path / "snapshot.jsonl")
+    handler = watcher.FileTreeHandler(repo, str(tmp_path / "tree.txt"), False, False, None, 0, cache_file)
+    with open(cache_file) as f:
+        full_size = len(f.readlines())
+
+    open(os.path.join(repo, "a", "new.txt"), "w").close()
+    handler.on_any_event(FileCreatedEvent(os.path.join(repo, "a", "new.txt")))
+    handler.flush()
+    with open(cache_file) as f:
+        lines = f.readlines()
+    assert len(lines) == full_size + 1
+    assert '"new.txt"' in lines[-1]
+
+    for i in range(2 * full_size):
+        open(os.path.join(repo, f"file{i}.txt"), "w").close()
+        handler.on_any_event(FileCreatedEvent(os.path.join(repo, f"file{i}.txt")))
+        handler.flush()
+    with open(cache_file) as f:
+        assert len(f.readlines()) <= 2 * full_size
+
+def test_snapshot_rejects_other_options_and_tolerates_truncation(repo, tmp_path):
+    cache_file = str(tmp_path / "snapshot.jsonl")
+    watcher.FileTreeHandler(repo, str(tmp_path / "tree.txt"), False, False, None, 0, cache_file).tree.close()
+    header = watcher.TreeSnapshot.header(repo, False, False, True)
+
+    assert watcher.TreeSnapshot(cache_file).load(watcher.TreeSnapshot.header(repo, True, False, True)) is None
+    with open(cache_file, "a") as f:
+        f.write('{"path": "a", "mtim')
+    records = watcher.TreeSnapshot(cache_file).load(header)
+    assert records is not None and "." in records
+
+def test_invalidate_keeps_prefix_siblings_and_descendants(repo):
+    tree = watcher.DirectoryTree(repo)
+    tree.render()
+    a = tree.find(os.path.join(repo, "a"))
+    foo, foobar = a.children["foo"], a.children["foobar"]
+
+    tree.invalidate(os.path.join(repo, "a", "foo"))
+
+    assert foo.lines is None and a.lines is None and tree.root_node.lines is None
+    assert foobar.lines is not None
+    assert tree.find(os.path.join(repo, "b", "c")).lines is not None
+
+def test_sibling_added_after_last_child_reuses_subtree(repo):
+    tree = watcher.DirectoryTree(repo)
+    tree.render()
+    c = tree.find(os.path.join(repo, "b", "c"))
+    cached = c.lines
+
+    os.makedirs(os.path.join(repo, "b", "d"))
+    for path in tree.apply_event(DirCreatedEvent(os.path.join(repo, "b", "d"))):
+        tree.invalidate(path)
+
+    assert tree.render() == fresh_render(repo)
+    assert c.lines is cached
+
+def test_cached_rows_are_not_indented(repo):
+    tree = watcher.DirectoryTree(repo)
+    tree.render()
+    c = tree.find(os.path.join(repo, "b", "c"))
+
+    assert c.lines and all(row.startswith(("├──", "└──")) for row, _, _ in c.lines)
+
+def test_events_applied_out_of_order_match_disk(repo):
+    tree = watcher.DirectoryTree(repo)
+    # b/x.txt was deleted and then a/z.txt moved onto it; the move's batch (keyed by a/) is flushed first
+    os.rename(os.path.join(repo, "a", "z.txt"), os.path.join(repo, "b", "x.txt"))
+    for event in (FileMovedEvent(os.path.join(repo, "a", "z.txt"), os.path.join(repo, "b", "x.txt")),
+                  FileDeletedEvent(os.path.join(repo, "b", "x.txt"))):
+        for path in tree.apply_event(event):
+            tree.invalidate(path)
+
+    assert tree.render() == fresh_render(repo)
+
+def test_worker_flushes_trailing_events(repo, tmp_path):
+    output = str(tmp_path / "tree.txt")
+    handler = watcher.FileTreeHandler(repo, output, False, False, None, 60, str(tmp_path / "snapshot.jsonl"),
+                                      debounce=0.05)
+    handler.start()
+    try:
+        open(os.path.join(repo, "late.txt"), "w").close()
+        handler.on_any_event(FileCreatedEvent(os.path.join(repo, "late.txt")))
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with open(output) as f:
+                if "late.txt" in f.read():
+                    break
+            time.sleep(0.02)
+    finally:
+        handler.stop()
+
+    with open(output) as f:
+        assert f.read().splitlines() == fresh_render(repo)
+    assert handler.pending == {}
+
+def test_own_output_and_noise_events_are_dropped(repo):
+    output = os.path.join(repo, "tree.txt")
+    cache_file = os.path.join(repo, ".snapshot.jsonl")
+    handler = watcher.FileTreeHandler(repo, output, False, False, None, 60, cache_file)
+
+    handler.on_any_event(FileModifiedEvent(output))
+    handler.on_any_event(FileCreatedEvent(output + ".tmp"))
+    handler.on_any_event(FileMovedEvent(output + ".tmp", output))
+    handler.on_any_event(FileModifiedEvent(os.path.join(repo, "top.txt")))
+    assert handler.pending == {}
+
+    handler.on_any_event(FileCreatedEvent(os.path.join(repo, "a", "new.txt")))
+    assert list(handler.pending) == [os.path.join(repo, "a")]
+
+def test_render_format(repo):
+    assert watcher.print_directory_tree(repo) == [
+        repo,
+        "├── a/",
+        "│   ├── foo/",
+        "│   │   └── x.py",
+        "│   ├── foobar/",
+        "│   │   └── y.py",
+        "│   └── z.txt",
+        "├── b/",
+        "│   └── c/",
+        "│       └── d.txt",
+        "└── top.txt"
+    ]
+
+def test_nested_gitignore(repo):
+    with open(os.path.join(repo, ".gitignore"), "w") as f:
+        f.write("*.txt\n!top.txt\n/b/\n")
+    with open(os.path.join(repo, "a", ".gitignore"), "w") as f:
+        f.write("foo/\n!z.txt\n")
+
+    lines = watcher.DirectoryTree(repo).render()
+
+    assert lines == [repo, "├── a/", "│   ├── foobar/", "│   │   └── y.py", "│   └── z.txt",
+                     "└── top.txt"]
+
+def test_print_directory_tree_honors_nested_gitignore_by_default(repo):
+    with open(os.path.join(repo, "a", ".gitignore"), "w") as f:
+        f.write("foo/\n")
+
+    assert watcher.print_directory_tree(repo) == watcher.DirectoryTree(repo).render()
+    assert "│   ├── foo/" not in watcher.print_directory_tree(repo)
+
+def test_unreadable_gitignore_is_skipped(repo):
+    os.symlink(os.path.join(repo, "missing"), os.path.join(repo, "a", ".gitignore"))
+
+    assert watcher.DirectoryTree(repo, show_hidden=True).find(os.path.join(repo, "a", "foo")) is not None
+
+def test_parallel_scan_matches_serial(repo):
+    for i in range(20):
+        os.makedirs(os.path.join(repo, "wide", f"dir{i}", "sub"))
+        open(os.path.join(repo, "wide", f"dir{i}", "sub", "f.py"), "w").close()
+
+    serial = watcher.DirectoryTree(repo, max_workers=1)
+    parallel = watcher.DirectoryTree(repo, max_workers=8)
+    try:
+        assert parallel.render() == serial.render()
+    finally:
+        parallel.close()
+
+def test_gitignore_change_rescans_directory(repo):
+    tree = watcher.DirectoryTree(repo)
+    tree.render()
+    gitignore = os.path.join(repo, "a", ".gitignore")
+    with open(gitignore, "w") as f:
+        f.write("foo/\n")
+
+    for path in tree.apply_event(FileCreatedEvent(gitignore)):
+        tree.invalidate(path)
+
+    assert "│   ├── foo/" not in tree.render()
+    assert tree.render() == watcher.DirectoryTree(repo).render()
+
+def test_trailing_slash_root_ignores_gitignore_outside_tree(repo, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open(tmp_path / ".gitignore", "w") as f:
+        f.write("*.txt\n")
+    tree = watcher.DirectoryTree("repo" + os.sep)
+    tree.render()
+    open(os.path.join(repo, "a", "new.txt"), "w").close()
+
+    for path in tree.apply_event(FileCreatedEvent(os.path.join(repo, "a", "new.txt"))):
+        tree.invalidate(path)
+
+    lines = tree.render()
+    assert lines[0] == "repo"
+    assert "│   ├── new.txt" in lines
+    assert lines == watcher.DirectoryTree("repo").render()
@@ -0,0 +1,72 @@
+# taskmaster_ai/tests/test_logging_config.py
+
+import json
+import logging
+import queue
+import subprocess
+import sys
+import pytest
+from taskmaster.core.engine import CoreEngine, Task
+from taskmaster.logging_config import _DeferredQueueHandler, configure_logging, shutdown_logging
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    level = root.level
+    yield root
+    shutdown_logging()
+    root.setLevel(level)
+
+def test_import_does_not_configure_root_logger():
+    # A fresh interpreter, since this one has already imported the package
+    code = ("import logging; root = logging.getLogger(); before = (list(root.handlers), root.level); "
+            "import taskmaster.cli.cli; assert (list(root.handlers), root.level) == before")
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_invalid_level_is_rejected_before_configuring(restore_root_logger):
+    handlers = list(restore_root_logger.handlers)
+    with pytest.raises(ValueError):
+        configure_logging(level="bogus")
+    assert restore_root_logger.handlers == handlers
+
+def test_async_structured_logging(restore_root_logger, tmp_path):
+    log_file = tmp_path / "taskmaster.log"
+    configure_logging(level="info", structured=True, log_file=str(log_file))
+
+    logging.getLogger("CoreEngine").info("Processed %s tasks", 3, extra={"workflow_id": "wf1"})
+    logging.getLogger("CoreEngine").debug("Filtered out")
+    shutdown_logging()
+
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["message"] == "Processed 3 tasks"
+    assert entry["level"] == "INFO"
+    assert entry["workflow_id"] == "wf1"
+
+def test_level_from_environment(restore_root_logger, monkeypatch):
+    monkeypatch.setenv("TASKMASTER_LOG_LEVEL", "error")
+    root = configure_logging(asynchronous=False)
+    assert root.level == logging.ERROR
+
+@pytest.mark.parametrize("level, logged", [(logging.WARNING, False), (logging.DEBUG, True)])
+def test_create_workflow_builds_debug_message_only_when_enabled(restore_root_logger, monkeypatch, level, logged):
+    restore_root_logger.setLevel(level)
+    engine = CoreEngine()
+    calls = []
+    monkeypatch.setattr(engine.orchestrator.logger, "debug", lambda *args, **kwargs: calls.append(args))
+    tasks = [Task(str(i), "summarization", {"text": "Text"}, {}) for i in range(3)]
+
+    assert engine.orchestrator.create_workflow("lazy_logging", tasks, {})
+    assert bool(calls) == logged
+
+def test_deferred_handler_formats_mutable_args_eagerly():
+    handler = _DeferredQueueHandler(queue.SimpleQueue())
+    scalar = logging.LogRecord("test", logging.INFO, __file__, 1, "Processed %s tasks in %s", (3, "wf1"), None)
+    dependencies = {"2": ["1"]}
+    mutable = logging.LogRecord("test", logging.INFO, __file__, 1, "Dependencies: %s", (dependencies,), None)
+
+    assert handler.prepare(scalar) is scalar
+    prepared = handler.prepare(mutable)
+    dependencies["3"] = ["2"]
+    assert prepared.getMessage() == "Dependencies: {'2': ['1']}"
@@ -1,7 +1,11 @@
 # taskmaster_ai/tests/test_memory_manager.py
 
+import json
+import time
 import pytest
-from taskmaster.memory.memory_manager import MemoryManager
+import sqlite3
+import threading
+from taskmaster.memory.memory_manager import LONG_TERM, RESULT, SHORT_TERM, WORKFLOW, MemoryManager, RetentionPolicy
 
 @pytest.fixture
 def memory_manager():
@@ -48,4 +52,215 @@ def test_clear_all_data(memory_manager):
     assert memory_manager.get_data(key2) is None
 
 def test_nonexistent_key(memory_manager):
-    assert memory_manager.get_data("nonexistent_key") is None
\ No newline at end of file
+    assert memory_manager.get_data("nonexistent_key") is None
+
+
+def test_large_values_spill_to_blobs(tmp_path):
+    manager = MemoryManager(str(tmp_path / "memory.db"), spill_threshold=100)
+    large = {"code": "x" * 1000}
+
+    assert manager.store_data("large_1", large)
+    assert manager.store_data("large_2", large)
+    assert manager.store_data("small", {"value": 1})
+
+    assert manager.get_data("large_1") == large
+    assert manager.get_data("small") == {"value": 1}
+    assert json.loads(manager.get_raw("large_2")) == large
+    # Identical values are stored once
+    assert len(list(manager.blob_store.digests())) == 1
+    digest = next(manager.blob_store.digests())
+    with manager.blob_store.open(digest) as view:
+        assert json.loads(str(view, 'utf-8')) == large
+    # The mapping is closed when the block exits
+    with pytest.raises(ValueError):
+        view.tobytes()
+    row = manager.conn.execute("SELECT value, blob FROM memory WHERE key = 'large_1'").fetchone()
+    assert row[0] is None and row[1]
+
+def test_collect_blobs_removes_unreferenced(tmp_path):
+    manager = MemoryManager(str(tmp_path / "memory.db"), spill_threshold=10)
+    manager.store_data("a", {"text": "a" * 50})
+    manager.store_data("b", {"text": "b" * 50})
+
+    manager.clear_data("a")
+    assert manager.collect_blobs() == 1
+    assert manager.get_data("b") == {"text": "b" * 50}
+
+def test_in_memory_database_does_not_spill():
+    manager = MemoryManager(':memory:', spill_threshold=10)
+    assert manager.blob_store is None
+    assert manager.store_data("key", {"text": "x" * 50})
+    assert manager.get_data("key") == {"text": "x" * 50}
+
+def test_expired_rows_are_hidden_and_swept(memory_manager):
+    memory_manager.store_data("short", {"value": 1}, ttl=-1)
+    memory_manager.store_data("long", {"value": 2}, ttl=3600)
+    memory_manager.store_data("forever", {"value": 3})
+
+    assert memory_manager.get_data("short") is None
+    assert memory_manager.sweep() == 1
+    keys = {row[0] for row in memory_manager.conn.execute("SELECT key FROM memory")}
+    assert keys == {"long", "forever"}
+
+def test_cached_read_does_not_outlive_expiry(memory_manager):
+    memory_manager.store_data("key", {"value": 1}, ttl=0.05)
+    assert memory_manager.get_data("key") == {"value": 1}
+    time.sleep(0.1)
+    assert memory_manager.get_data("key") is None
+
+def test_cached_read_sees_overwrites_and_clears(memory_manager):
+    memory_manager.store_data("key", {"value": 1})
+    assert memory_manager.get_data("key") == {"value": 1}
+    memory_manager.store_data("key", {"value": 2})
+    assert memory_manager.get_data("key") == {"value": 2}
+    memory_manager.clear_all_data(namespace=SHORT_TERM)
+    assert memory_manager.get_data("key") is None
+
+def test_read_racing_a_store_does_not_cache_the_old_value(memory_manager):
+    memory_manager.store_data("key", {"value": 1})
+    select = memory_manager._select
+
+    def select_then_overwrite(key, namespace):
+        row = select(key, namespace)
+        memory_manager._select = select
+        memory_manager.store_data("key", {"value": 2})
+        return row
+
+    memory_manager._select = select_then_overwrite
+    assert memory_manager.get_data("key") == {"value": 1}
+    assert memory_manager.get_data("key") == {"value": 2}
+
+def test_read_cache_can_be_disabled():
+    manager = MemoryManager(':memory:', read_cache_size=0)
+    manager.store_data("key", {"value": 1})
+    assert manager.get_data("key") == {"value": 1}
+    assert len(manager._read_cache) == 0
+
+def test_default_ttl_from_retention_policy():
+    manager = MemoryManager(':memory:', retention=RetentionPolicy(default_ttl=-1))
+    manager.store_data("key", {"value": 1})
+    manager.store_data("pinned", {"value": 2}, ttl=3600)
+
+    assert manager.get_data("key") is None
+    assert manager.get_data("pinned") == {"value": 2}
+
+def test_sweep_enforces_max_rows_in_batches():
+    manager = MemoryManager(':memory:', retention=RetentionPolicy(max_rows=10, batch_size=3))
+    for i in range(25):
+        manager.store_data(f"key-{i}", {"value": i})
+
+    assert manager.sweep() == 15
+    keys = {row[0] for row in manager.conn.execute("SELECT key FROM memory")}
+    assert keys == {f"key-{i}" for i in range(15, 25)}
+
+def test_sweep_collects_blobs_and_compacts(tmp_path):
+    manager = MemoryManager(str(tmp_path / "memory.db"), spill_threshold=30)
+    manager.store_data("large", {"text": "x" * 50}, ttl=-1)
+    manager.store_data("small", {"text": "y"})
+
+    assert manager.sweep() == 1
+    assert list(manager.blob_store.digests()) == []
+    assert manager.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    assert manager.compact(full=True)
+
+def test_sweep_converts_legacy_database_to_incremental_vacuum(tmp_path):
+    db_path = str(tmp_path / "memory.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE memory (key TEXT PRIMARY KEY, value TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+    conn.commit()
+    conn.close()
+
+    manager = MemoryManager(db_path)
+    assert manager.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 0
+    manager.store_data("short", {"text": "x" * 10000}, ttl=-1)
+
+    assert manager.sweep() == 1
+    assert manager.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+def test_background_sweeper(memory_manager):
+    memory_manager.retention.sweep_interval = 0.01
+    memory_manager.store_data("short", {"value": 1}, ttl=-1)
+    memory_manager.start_sweeper()
+    try:
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if memory_manager.conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0] == 0:
+                break
+            time.sleep(0.01)
+    finally:
+        memory_manager.stop_sweeper()
+    assert memory_manager.conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0] == 0
+
+def test_namespaces_do_not_collide(memory_manager):
+    memory_manager.store_data("task-1", {"context": "short"})
+    memory_manager.store_data("task-1", {"result": "done"}, namespace=RESULT)
+
+    assert memory_manager.get_data("task-1") == {"context": "short"}
+    assert memory_manager.get_data("task-1", namespace=RESULT) == {"result": "done"}
+    assert memory_manager.keys(RESULT) == ["task-1"]
+
+    assert memory_manager.clear_all_data(namespace=RESULT)
+    assert memory_manager.get_data("task-1", namespace=RESULT) is None
+    assert memory_manager.get_data("task-1") == {"context": "short"}
+
+def test_unknown_namespace_is_rejected(memory_manager):
+    with pytest.raises(ValueError):
+        memory_manager.store_data("key", {}, namespace="scratch")
+    with pytest.raises(ValueError):
+        memory_manager.get_data("key", "scratch")
+    with pytest.raises(ValueError):
+        memory_manager.clear_all_data(namespace="scratch")
+    with pytest.raises(ValueError):
+        memory_manager.keys("scratch")
+
+def test_namespace_ttls():
+    manager = MemoryManager(':memory:', retention=RetentionPolicy(namespace_ttls={SHORT_TERM: -1}))
+    manager.store_data("key", {"value": 1})
+    manager.store_data("key", {"value": 2}, namespace=LONG_TERM)
+
+    assert manager.get_data("key") is None
+    assert manager.get_data("key", namespace=LONG_TERM) == {"value": 2}
+
+def test_sharded_keyspace_spreads_keys_and_reopens(tmp_path):
+    db_path = str(tmp_path / "memory.db")
+    manager = MemoryManager(db_path, shards=4)
+    for i in range(40):
+        assert manager.store_data(f"key-{i}", {"value": i}, namespace=RESULT)
+
+    counts = [shard.conn.execute("SELECT COUNT(*) FROM memory").fetchone()[0] for shard in manager.shards]
+    assert sum(counts) == 40 and all(counts)
+    manager.close()
+
+    reopened = MemoryManager(db_path, shards=4)
+    assert reopened.get_data("key-7", namespace=RESULT) == {"value": 7}
+    assert len(reopened.keys(RESULT)) == 40
+    with pytest.raises(ValueError):
+        MemoryManager(db_path, shards=2)
+
+def test_concurrent_writers_across_shards(tmp_path):
+    manager = MemoryManager(str(tmp_path / "memory.db"), shards=4)
+
+    def write(worker):
+        for i in range(50):
+            assert manager.store_data(f"{worker}-{i}", {"value": i}, namespace=RESULT)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(manager.keys(RESULT)) == 200
+
+def test_legacy_table_is_migrated_to_namespaces(tmp_path):
+    db_path = str(tmp_path / "memory.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE memory (key TEXT PRIMARY KEY, value TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)")
+    conn.execute("INSERT INTO memory (key, value) VALUES ('workflows', '{\"w\": 1}')")
+    conn.commit()
+    conn.close()
+
+    manager = MemoryManager(db_path)
+    assert manager.get_data("workflows") == {"w": 1}
+    assert manager.store_data("workflows", {"w": 2}, namespace=WORKFLOW)
+    assert manager.get_data("workflows", namespace=WORKFLOW) == {"w": 2}
@@ -0,0 +1,117 @@
+# taskmaster_ai/tests/test_metrics.py
+
+import pytest
+from taskmaster.core.engine import CoreEngine, Task
+from taskmaster.memory.memory_manager import MemoryManager
+from taskmaster.monitoring.metrics import MetricsRegistry
+from taskmaster.monitoring.tracing import Tracer
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+def test_counter_and_gauge(registry):
+    counter = registry.counter("requests", "Requests served")
+    counter.inc(status="ok")
+    counter.inc(2, status="ok")
+    gauge = registry.gauge("in_flight")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+
+    assert counter.get(status="ok") == 3
+    assert gauge.get() == 1
+    with pytest.raises(ValueError):
+        counter.inc(-1)
+
+def test_histogram_buckets(registry):
+    histogram = registry.histogram("latency_seconds", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value)
+
+    text = registry.to_prometheus()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert 'latency_seconds_count 3' in text
+    assert histogram.sum() == pytest.approx(5.55)
+
+def test_registry_rejects_type_mismatch(registry):
+    registry.counter("tasks")
+    with pytest.raises(ValueError):
+        registry.gauge("tasks")
+
+def test_write_prometheus(registry, tmp_path):
+    registry.counter("tasks").inc(task_type="summarization")
+    path = tmp_path / "metrics.prom"
+
+    assert registry.write_prometheus(str(path))
+    assert 'tasks_total{task_type="summarization"} 1.0' in path.read_text()
+
+def test_engine_records_task_metrics(registry):
+    tracer = Tracer(enabled=True)
+    engine = CoreEngine(metrics_registry=registry, tracer=tracer)
+
+    engine.process_task(Task("1", "summarization", {"text": "Some text"}, {}))
+    engine.process_task(Task("2", "unknown", {}, {}))
+
+    tasks = registry.get("taskmaster_tasks")
+    assert tasks.get(task_type="summarization", status="success") == 1
+    assert tasks.get(task_type="unknown", status="error") == 1
+    assert registry.get("taskmaster_agent_execution_seconds").count(task_type="summarization") == 1
+    assert registry.get("taskmaster_memory_write_seconds").count() >= 1
+    assert registry.get("taskmaster_serialization_seconds").count(operation="dumps") >= 1
+    assert registry.get("taskmaster_tasks_in_progress").get() == 0
+    assert [span.name for span in tracer.finished_spans()] == ["process_task", "process_task"]
+
+def test_workflow_spans_and_queue_wait(registry):
+    tracer = Tracer(enabled=True)
+    engine = CoreEngine(metrics_registry=registry, tracer=tracer)
+    tasks = [
+        Task("1", "summarization", {"text": "Text 1"}, {}),
+        Task("2", "sentiment_analysis", {"text": "Text 2"}, {})
+    ]
+    engine.orchestrator.create_workflow("metrics_workflow", tasks, {"2": ["1"]})
+    engine.orchestrator.execute_workflow("metrics_workflow")
+
+    spans = tracer.finished_spans()
+    workflow_span = spans[-1]
+    assert workflow_span.name == "execute_workflow"
+    assert all(span.trace_id == workflow_span.trace_id for span in spans)
+    assert all(span.parent_id == workflow_span.span_id for span in spans[:-1])
+    assert registry.get("taskmaster_task_queue_wait_seconds").count(task_type="sentiment_analysis") == 1
+
+def test_stream_workflow_span_is_not_current_while_suspended(registry):
+    tracer = Tracer(enabled=True)
+    engine = CoreEngine(metrics_registry=registry, tracer=tracer)
+    engine.orchestrator.create_workflow("streamed_spans", [Task("1", "summarization", {"text": "Text"}, {})], {})
+
+    for _ in engine.orchestrator.stream_workflow("streamed_spans"):
+        with tracer.span("consumer"):
+            pass
+
+    consumer, workflow_span = tracer.finished_spans()[-2:]
+    assert consumer.name == "consumer" and consumer.parent_id is None
+    assert workflow_span.name == "execute_workflow"
+    assert tracer.finished_spans()[0].parent_id == workflow_span.span_id
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("noop"):
+        pass
+    assert tracer.finished_spans() == []
+
+def test_disabled_spans_do_not_share_attributes():
+    tracer = Tracer()
+    with tracer.span("first") as span:
+        span.attributes["leaked"] = True
+    with tracer.span("second") as span:
+        assert span.attributes == {}
+
+def test_memory_read_latency_includes_cache_hits(registry):
+    manager = MemoryManager(':memory:', metrics_registry=registry)
+    manager.store_data("key", {"value": 1})
+    manager.get_data("key")
+    manager.get_data("key")
+    assert registry.get("taskmaster_memory_read_seconds").count() == 2
@@ -1,7 +1,10 @@
 # taskmaster_ai/tests/test_orchestrator.py
 
+import asyncio
+import json
 import pytest
 from taskmaster.core.engine import CoreEngine, Task
+from taskmaster.memory.memory_manager import WORKFLOW
 from taskmaster.orchestrator.orchestrator import Orchestrator
 from taskmaster.models import TaskResult  # Changed import
 
@@ -70,3 +73,141 @@ def test_nonexistent_workflow(orchestrator):
     
     with pytest.raises(ValueError):
         orchestrator.get_workflow_status("nonexistent_workflow")
+
+def test_profile_workflow(orchestrator, tmp_path):
+    tasks = [
+        Task("1", "summarization", {"text": "Text 1"}, {}),
+        Task("2", "sentiment_analysis", {"text": "Text 2"}, {})
+    ]
+    orchestrator.create_workflow("profiled", tasks, {"2": ["1"]})
+    report_path = tmp_path / "profile.json"
+
+    results, saved = orchestrator.profile_workflow("profiled", str(report_path))
+
+    assert saved and set(results) == {"1", "2"}
+    report = json.loads(report_path.read_text())
+    assert [task["task_id"] for task in report["tasks"]] == ["1", "2"]
+    assert all("allocated_bytes" in task and task["top_functions"] for task in report["tasks"])
+    assert any("process_task" in row["function"] for row in report["functions"])
+    assert (tmp_path / "profile.json.pstats").exists()
+
+    results, saved = orchestrator.profile_workflow("profiled", str(tmp_path / "missing" / "profile.json"))
+    assert not saved and set(results) == {"1", "2"}
+
+def make_chain(orchestrator, workflow_id="streamed"):
+    tasks = [
+        Task("1", "summarization", {"text": "Text 1"}, {}),
+        Task("2", "sentiment_analysis", {"text": "Text 2"}, {}),
+        Task("3", "named_entity_recognition", {"text": "Text 3"}, {})
+    ]
+    orchestrator.create_workflow(workflow_id, tasks, {"2": ["1"], "3": ["2"]})
+    return tasks
+
+def test_stream_workflow_yields_results_as_tasks_complete(orchestrator):
+    tasks = make_chain(orchestrator)
+    stream = orchestrator.stream_workflow("streamed")
+
+    task_id, result = next(stream)
+    assert task_id == "1" and isinstance(result, TaskResult)
+    # Later tasks have not run yet when the first result is delivered
+    assert [task.status for task in tasks] == ["Completed", "Created", "Created"]
+
+    assert [task_id for task_id, _ in stream] == ["2", "3"]
+    assert orchestrator.get_workflow_status("streamed")["is_complete"]
+
+def test_astream_workflow(orchestrator):
+    make_chain(orchestrator)
+
+    async def collect():
+        return [task_id async for task_id, _ in orchestrator.astream_workflow("streamed")]
+
+    assert asyncio.run(collect()) == ["1", "2", "3"]
+
+def test_subscribers_receive_status_changes(orchestrator):
+    make_chain(orchestrator)
+    make_chain(orchestrator, "other")
+    events = []
+    subscription = orchestrator.subscribe(events.append, workflow_id="streamed")
+
+    orchestrator.execute_workflow("streamed")
+    orchestrator.execute_workflow("other")
+
+    assert events[0]["event"] == "workflow_started" and events[-1]["event"] == "workflow_finished"
+    assert {event["workflow_id"] for event in events} == {"streamed"}
+    transitions = [(e["task_id"], e["previous_status"], e["status"]) for e in events if e["event"] == "task_status"]
+    assert transitions[:2] == [("1", "Created", "Running"), ("1", "Running", "Completed")]
+    assert len(transitions) == 6
+
+    assert orchestrator.unsubscribe(subscription)
+    orchestrator.execute_workflow("streamed")
+    assert len(events) == 8
+
+def test_failed_task_skips_its_dependents(orchestrator):
+    tasks = [
+        Task("1", "unknown", {"text": "Text 1"}, {}),
+        Task("2", "summarization", {"text": "Text 2"}, {}),
+        Task("3", "summarization", {"text": "Text 3"}, {}),
+        Task("4", "sentiment_analysis", {"text": "Text 4"}, {})
+    ]
+    orchestrator.create_workflow("failing", tasks, {"2": ["1"], "3": ["2"]})
+
+    results = orchestrator.execute_workflow("failing")
+
+    assert [task.status for task in tasks] == ["Failed", "Skipped", "Skipped", "Completed"]
+    assert results["2"].result is None and "dependency 1 failed" in results["2"].metadata["error"]
+    status = orchestrator.get_workflow_status("failing")
+    assert (status["completed_tasks"], status["failed_tasks"], status["skipped_tasks"]) == (1, 1, 2)
+    assert status["pending_tasks"] == 0 and status["is_complete"]
+
+def test_saved_workflow_does_not_persist_task_context(orchestrator):
+    make_chain(orchestrator)
+    orchestrator.execute_workflow("streamed")
+    orchestrator.execute_workflow("streamed")
+
+    saved = orchestrator.memory_manager.get_data('workflows', namespace=WORKFLOW)["streamed"]
+    assert all("context" not in task["parameters"] for task in saved["tasks"])
+
+def test_rerun_status_events_start_from_created(orchestrator):
+    make_chain(orchestrator)
+    orchestrator.execute_workflow("streamed")
+    events = []
+    orchestrator.subscribe(events.append, workflow_id="streamed")
+
+    orchestrator.execute_workflow("streamed")
+
+    transitions = [(e["task_id"], e["previous_status"], e["status"]) for e in events if e["event"] == "task_status"]
+    assert transitions[0] == ("1", "Created", "Running")
+
+def test_failing_subscriber_does_not_stop_workflow(orchestrator):
+    make_chain(orchestrator)
+
+    def broken(event):
+        raise RuntimeError("subscriber failed")
+
+    orchestrator.subscribe(broken)
+    assert len(orchestrator.execute_workflow("streamed")) == 3
+
+def test_cyclic_dependencies_are_rejected(orchestrator):
+    tasks = [Task("1", "summarization", {"text": "a"}, {}), Task("2", "summarization", {"text": "b"}, {})]
+    orchestrator.create_workflow("cyclic", tasks, {"1": ["2"], "2": ["1"]})
+    with pytest.raises(ValueError, match="cyclic"):
+        orchestrator.execute_workflow("cyclic")
+
+def test_legacy_workflows_are_migrated_once(core_engine, tmp_path):
+    db_path = str(tmp_path / "orchestrator.db")
+    legacy = Orchestrator(core_engine, db_path=db_path)
+    make_chain(legacy)
+    memory = legacy.memory_manager
+    memory.store_data('workflows', memory.get_data('workflows', namespace=WORKFLOW))
+    memory.clear_data('workflows', namespace=WORKFLOW)
+    memory.close()
+
+    migrated = Orchestrator(core_engine, db_path=db_path)
+    assert "streamed" in migrated.workflows
+    assert migrated.memory_manager.get_data('workflows') is None
+    # An empty workflow set is not mistaken for a missing one and replaced by a stale legacy row
+    migrated.workflows.clear()
+    migrated._save_workflows()
+    migrated.memory_manager.store_data('workflows', {"stale": {}})
+    migrated.memory_manager.close()
+    assert Orchestrator(core_engine, db_path=db_path).workflows == {}
@@ -0,0 +1,136 @@
+# taskmaster_ai/tests/test_retrieval.py
+
+import threading
+import numpy as np
+import pytest
+from taskmaster.core.engine import CoreEngine, Task
+from taskmaster.memory.memory_manager import LONG_TERM, RESULT, SHORT_TERM, MemoryManager
+from taskmaster.memory.retrieval import HashedVectorizer, MemoryIndex, VectorIndex, text_of
+
+DOCUMENTS = {
+    "weather": {"summary": "Heavy rain and strong wind are expected across the coast tomorrow."},
+    "finance": {"summary": "Quarterly revenue grew while operating costs fell sharply."},
+    "sports": {"summary": "The home team won the final after extra time.", "score": 3}
+}
+
+@pytest.fixture
+def memory_manager():
+    manager = MemoryManager(':memory:', search_index=MemoryIndex())
+    for key, data in DOCUMENTS.items():
+        manager.store_data(key, data, namespace=RESULT)
+    return manager
+
+def test_text_of_flattens_nested_values():
+    assert text_of({"a": "one", "b": ["two", {"c": "three"}], "d": 4}) == "one two three "
+
+def test_vectorizer_is_normalized_and_deterministic():
+    vectorizer = HashedVectorizer(64)
+    vector = vectorizer.encode("rain rain wind")
+
+    assert vector.dtype == np.float32
+    assert np.isclose(np.linalg.norm(vector), 1.0)
+    assert np.array_equal(vector, HashedVectorizer(64).encode("rain rain wind"))
+    assert not vectorizer.encode("").any()
+
+@pytest.mark.parametrize("mode", ["text", "vector", "hybrid"])
+def test_search_ranks_relevant_result_first(memory_manager, mode):
+    results = memory_manager.search("will it rain tomorrow on the coast", k=2, mode=mode)
+
+    assert results[0]["key"] == "weather"
+    assert results[0]["data"] == DOCUMENTS["weather"]
+
+def test_only_indexed_namespaces_are_searchable(memory_manager):
+    memory_manager.store_data("notes", {"text": "rain on the coast"}, namespace=SHORT_TERM)
+    memory_manager.store_data("facts", {"text": "rain on the coast"}, namespace=LONG_TERM)
+
+    assert memory_manager.search("rain", namespace=SHORT_TERM) == []
+    assert [r["key"] for r in memory_manager.search("rain", namespace=LONG_TERM)] == ["facts"]
+
+def test_search_query_syntax_is_escaped(memory_manager):
+    assert memory_manager.search('revenue" OR NEAR(', mode="text")[0]["key"] == "finance"
+
+def test_cleared_and_expired_values_leave_the_index(memory_manager):
+    memory_manager.clear_data("weather", namespace=RESULT)
+    memory_manager.store_data("stale", {"summary": "rain"}, ttl=-1, namespace=RESULT)
+
+    keys = [r["key"] for r in memory_manager.search("rain coast", mode="text")]
+    assert "weather" not in keys and "stale" not in keys
+    assert "stale" not in memory_manager.search_index.vectors[RESULT]
+
+def test_unknown_search_mode(memory_manager):
+    with pytest.raises(ValueError):
+        memory_manager.search("rain", mode="fuzzy")
+
+def test_vector_index_ann_matches_exact_top_hit():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((5000, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    approximate = VectorIndex(32, exact_threshold=100)
+    exact = VectorIndex(32, exact_threshold=10 ** 6)
+    for i, vector in enumerate(vectors):
+        approximate.add(str(i), vector)
+        exact.add(str(i), vector)
+
+    for i in range(20):
+        query = vectors[i] + 0.05 * rng.standard_normal(32).astype(np.float32)
+        query /= np.linalg.norm(query)
+        assert approximate.search(query, 1)[0][0] == exact.search(query, 1)[0][0] == str(i)
+
+    assert approximate.remove("0") and "0" not in approximate
+    assert len(approximate) == 4999
+
+def test_index_reloads_persisted_vectors(tmp_path):
+    db_path = str(tmp_path / "index.db")
+    index = MemoryIndex(db_path)
+    index.add(RESULT, "weather", DOCUMENTS["weather"])
+    index.close()
+
+    # Each namespace is its own database, so their writers never share a file lock
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["index.db.long_term", "index.db.result"]
+    reopened = MemoryIndex(db_path)
+    assert reopened.search_similar("rain tomorrow")[0][0] == "weather"
+
+def test_engine_passes_related_results_as_context():
+    engine = CoreEngine(memory_manager=MemoryManager(':memory:', search_index=MemoryIndex()), related_context=2)
+    engine.process_task(Task("1", "summarization", {"text": "Rain and wind hit the coast."}, {}))
+    engine.process_task(Task("2", "summarization", {"text": "Revenue grew this quarter."}, {}))
+
+    agent = engine.agent_registry["summarization"]
+    seen = []
+    process_task = agent.process_task
+    agent.process_task = lambda task: seen.append(task.parameters["related_context"]) or process_task(task)
+    task = Task("3", "summarization", {"text": "More rain on the coast."}, {})
+    engine.process_task(task)
+
+    related = seen[0]
+    assert related[0]["key"] == "1"
+    assert all(item["key"] != "3" for item in related)
+    # Only the agent sees it; it is not persisted with the task
+    assert "related_context" not in task.parameters
+
+def test_concurrent_writes_to_different_namespaces(tmp_path):
+    manager = MemoryManager(str(tmp_path / "memory.db"), shards=2,
+                            search_index=MemoryIndex(str(tmp_path / "index.db")))
+
+    def write(namespace):
+        for i in range(50):
+            assert manager.store_data(f"{namespace}-{i}", {"text": f"rain report {i}"}, namespace=namespace)
+
+    threads = [threading.Thread(target=write, args=(namespace,)) for namespace in (LONG_TERM, RESULT)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(manager.search_index.vectors[LONG_TERM]) == len(manager.search_index.vectors[RESULT]) == 50
+    assert manager.search("rain", k=3, namespace=LONG_TERM, mode="text")
+
+def test_index_failure_does_not_fail_the_store(memory_manager, caplog):
+    def fail(namespace, key, data):
+        raise RuntimeError("index unavailable")
+
+    memory_manager.search_index.add = fail
+    assert memory_manager.store_data("weather", DOCUMENTS["weather"], namespace=RESULT)
+    assert memory_manager.get_data("weather", namespace=RESULT) == DOCUMENTS["weather"]
+    assert "Error indexing data for key weather" in caplog.text
+    assert "Error storing data" not in caplog.text
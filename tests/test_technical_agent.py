@@ -41,4 +41,80 @@ def test_unsupported_task_type(technical_agent):
     task = Task("4", "unsupported_task", {"code": "print('Hello, World!')"}, {"language": "python"})
     result = technical_agent.process_task(task)
     assert "error" in result
-    assert "Unsupported task type" in result["error"]
\ No newline at end of file
+    assert "Unsupported task type" in result["error"]
+
+
+SAMPLE = '''def average(values, weights=[]):
+    """Weighted average."""
+    unused = len(values)
+    total = sum(values)
+    return total / len(values) + 1 / 0
+
+def ratio(a, b):
+    if b == 0:
+        return None
+    return a / b
+
+class Report:
+    def render(self):
+        try:
+            return 1 / self.count
+        except:
+            return None
+'''
+
+def checks(findings):
+    return {(finding["line"], finding["check"]) for finding in findings}
+
+def test_review_code_finds_missing_docstrings_and_bare_except(technical_agent):
+    result = technical_agent.review_code(SAMPLE, "python")
+    assert checks(result["review_comments"]) == {
+        (7, "missing-docstring"), (12, "missing-docstring"), (13, "missing-docstring"), (16, "bare-except")}
+
+def test_identify_bugs_finds_unused_variables_and_division_by_zero(technical_agent):
+    result = technical_agent.identify_bugs(SAMPLE, "python")
+    assert checks(result["bugs"]) == {(1, "mutable-default"), (3, "unused-variable"), (5, "division-by-zero")}
+
+def test_unchecked_divisor_is_reported_and_closure_reads_count_as_use(technical_agent):
+    code = "def f(a, b):\n    c = a / b\n    def g():\n        return c\n    return g\n"
+    assert checks(technical_agent.identify_bugs(code, "python")["bugs"]) == {(2, "possible-division-by-zero")}
+
+def test_syntax_error_is_reported_as_bug(technical_agent):
+    bugs = technical_agent.identify_bugs("def broken(:\n", "python")["bugs"]
+    assert bugs[0]["check"] == "syntax-error" and bugs[0]["line"] == 1
+
+def test_non_python_code_is_not_analyzed(technical_agent):
+    task = Task("5", "code_review", {"code": "int main() {}"}, {"language": "c"})
+    assert technical_agent.process_task(task) == {"review_comments": [], "language": "c", "analyzed": False}
+
+def test_analysis_is_cached_by_content_hash(technical_agent):
+    technical_agent.review_code(SAMPLE, "python")
+    technical_agent.identify_bugs(SAMPLE, "python")
+    technical_agent.identify_bugs(SAMPLE + "\n", "python")
+    assert technical_agent.parse_cache.misses == 2
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_multi_file_analysis_matches_single_file(max_workers):
+    agent = TechnicalAgent(max_workers=max_workers, parallel_threshold=2)
+    files = {f"pkg/module_{i}.py": SAMPLE.replace("average", f"average_{i}") for i in range(6)}
+    files["pkg/clean.py"] = '"""Module."""\n'
+    task = Task("6", "bug_identification", {"files": files}, {"language": "python"})
+    result = agent.process_task(task)
+
+    assert result["files_analyzed"] == 7
+    assert {bug["file"] for bug in result["bugs"]} == {f"pkg/module_{i}.py" for i in range(6)}
+    single = TechnicalAgent().identify_bugs(files["pkg/module_0.py"], "python")["bugs"]
+    assert [dict(bug, file="pkg/module_0.py") for bug in single] == \
+        [bug for bug in result["bugs"] if bug["file"] == "pkg/module_0.py"]
+
+def test_deeply_nested_expressions_do_not_abort_analysis():
+    agent = TechnicalAgent(max_workers=1, parallel_threshold=2)
+    files = {f"clean_{i}.py": '"""Module."""\n' for i in range(5)}
+    files["long.py"] = "x = " + " + ".join(["1"] * 600) + "\n"
+    files["huge.py"] = "x = " + " + ".join(["1"] * 20000) + "\n"
+    task = Task("7", "bug_identification", {"files": files}, {"language": "python"})
+
+    result = agent.process_task(task)
+
+    assert result["files_analyzed"] == 7
+    assert [(bug["file"], bug["check"]) for bug in result["bugs"]] == [("huge.py", "analysis-error")]